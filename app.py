@@ -1,19 +1,34 @@
-from flask import Flask, request, jsonify
-from job_search import scrape_indeed_jobs, scrape_linkedin_jobs
-from similarity_score import calculate_similarity_tfidf
+from flask import Flask, Response, request, jsonify, stream_with_context
+from job_search import DESCRIPTION_PLACEHOLDER, shutdown_driver_pool
+from job_fetch import fetch_jobs, iter_job_pages
+from similarity_score import calculate_similarity_tfidf_batch, calculate_similarity_doc2vec_batch
+from doc2vec_model import get_doc2vec_model
+from idf_model import get_idf_model
+from search_queue import SearchQueue, SearchQueueFull
+from job_store import get_job_store, get_job_index
+from job_records import JobBatch
+from job_dedup import JobDeduplicator
+from cache import TTLCache, make_key
+from text_processing import TEXT_TOKENIZER, get_nlp
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from nltk_setup import setup_nltk
 import os
+import json
 import logging
+import threading
+import time
 import traceback
 import sys
 
-# Initialize NLTK once at startup
-setup_nltk()
-
 # Load environment variables
 load_dotenv()
 
+# Memory-map the corpus-level IDF model once at startup
+idf_model = get_idf_model()
+
+# Descriptions the scrapers use when no real text could be fetched
+PLACEHOLDER_DESCRIPTIONS = {"", "N/A", DESCRIPTION_PLACEHOLDER}
+
 # Initialize Flask app
 app = Flask(__name__)
 
@@ -26,6 +41,149 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+def ingest_jobs(batch):
+    """
+    Record newly scraped jobs (a JobBatch): fold them into the IDF model and
+    add the ones with a real description to the local job store.
+    """
+    update_idf_model(batch)
+    try:
+        added = get_job_store().add_jobs(
+            [record.to_dict() for record in batch if record.description not in PLACEHOLDER_DESCRIPTIONS]
+        )
+        if added:
+            logging.info(f"Added {added} postings to the job store")
+    except Exception as e:
+        logging.error(f"Error updating job store: {str(e)}")
+
+def update_idf_model(batch):
+    """
+    Fold newly scraped job descriptions into the corpus-level IDF model. The
+    model is saved at most every IDF_SAVE_INTERVAL seconds, and on shutdown.
+    """
+    descriptions = [text for text in batch.descriptions if text not in PLACEHOLDER_DESCRIPTIONS]
+    try:
+        added = idf_model.partial_fit(descriptions)
+        if added:
+            idf_model.save_if_due()
+            logging.info(f"IDF model updated with {added} new descriptions ({idf_model.num_documents} total)")
+    except Exception as e:
+        logging.error(f"Error updating IDF model: {str(e)}")
+
+def _positive_int(data, name, default=None):
+    value = data.get(name, default)
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a positive integer")
+    if number < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return number
+
+def parse_search_request(data):
+    """
+    Read the search parameters shared by the recommendation endpoints.
+    Returns:
+        dict: Search parameters.
+    Raises:
+        ValueError: When the resume or job title is missing, or num_pages or
+            top_k is not a positive integer; the message is meant for the client.
+    """
+    data = data or {}
+    resume = data.get("resume")
+    job_title = data.get("job_title")
+    if not resume or not job_title:
+        raise ValueError("Resume and job title are required")
+
+    sources = []
+    if data.get("include_indeed", True):
+        sources.append("indeed")
+    if data.get("include_linkedin", True):
+        sources.append("linkedin")
+
+    return {
+        "resume": resume,
+        "job_title": job_title,
+        "location": data.get("location") or "",
+        "days_old": data.get("days_old", 7),
+        "num_pages": _positive_int(data, "num_pages", 1),
+        "sources": sources,
+        "scoring": data.get("scoring", "tfidf"),
+        "top_k": _positive_int(data, "top_k"),
+        "columnar": bool(data.get("columnar", False)),
+    }
+
+def score_jobs(resume, batch, scoring="tfidf"):
+    """
+    Set the similarity scores of a JobBatch.
+
+    "tfidf" scores against the warm corpus-level IDF model; "doc2vec" uses the
+    pre-trained Doc2Vec model and falls back to TF-IDF until one has been built.
+    """
+    job_descriptions = batch.descriptions
+    scores = None
+    if scoring == "doc2vec":
+        doc2vec_model = get_doc2vec_model()
+        if doc2vec_model is not None:
+            scores = calculate_similarity_doc2vec_batch(resume, job_descriptions, model=doc2vec_model)
+        else:
+            logging.warning("Doc2Vec scoring requested but no model is built, using TF-IDF")
+    if scores is None:
+        scores = calculate_similarity_tfidf_batch(resume, job_descriptions, idf_model=idf_model)
+    return batch.set_scores(scores)
+
+def rank_jobs(batch, top_k=None):
+    """
+    Sort a JobBatch by similarity score (highest to lowest), keeping the top_k best if given.
+    """
+    return batch.ranked(top_k)
+
+def search_job_store(search):
+    """
+    Match the resume against the stored postings whose title and location fit
+    the search, and return the top_k best.
+    Uses the Doc2Vec index when requested and a model is built, else TF-IDF.
+    Postings stored since the last request are indexed in the background, so
+    they show up in later searches.
+    """
+    mode = "doc2vec" if search["scoring"] == "doc2vec" and get_doc2vec_model() is not None else "tfidf"
+    index = get_job_index(mode)
+    index.load()
+    index.refresh_async()
+    return index.search(
+        search["resume"], search["top_k"], job_title=search["job_title"], location=search["location"]
+    )
+
+# Searches that topped up the job store recently, so repeats do not scrape again
+_recent_top_ups = TTLCache(maxsize=1024, ttl=float(os.getenv("STORE_TOP_UP_INTERVAL", "900")))
+_top_up_executor = None
+_top_up_lock = threading.Lock()
+
+def schedule_store_top_up(search):
+    """
+    Scrape the search in the background to add fresh postings to the job store.
+    """
+    global _top_up_executor
+    key = make_key(search["job_title"], search["location"], search["num_pages"], *search["sources"])
+    with _top_up_lock:
+        if _recent_top_ups.get(key):
+            return
+        _recent_top_ups.set(key, True)
+        if _top_up_executor is None:
+            _top_up_executor = ThreadPoolExecutor(max_workers=int(os.getenv("STORE_TOP_UP_WORKERS", "1")))
+
+    def top_up():
+        try:
+            ingest_jobs(JobBatch.from_dicts(fetch_jobs(search["job_title"], search["location"], search["num_pages"], search["sources"])))
+        except Exception as e:
+            logging.error(f"Error topping up job store: {str(e)}")
+
+    _top_up_executor.submit(top_up)
+
 @app.route('/recommend_jobs', methods=['POST'])
 def recommend_jobs():
     """
@@ -33,60 +191,33 @@ def recommend_jobs():
     """
     try:
         # Get JSON data from the request
-        data = request.json
-        resume = data.get("resume")
-        job_title = data.get("job_title")
-        location = data.get("location", "")
-        days_old = data.get("days_old", 7)
-        num_pages = data.get("num_pages", 1)
-        include_indeed = data.get("include_indeed", True)
-        include_linkedin = data.get("include_linkedin", True)
-
-        if not resume or not job_title:
-            return jsonify({"error": "Resume and job title are required"}), 400
-
-        all_jobs = []
-
-        # Fetch jobs from Indeed
-        if include_indeed:
-            try:
-                logging.info("Fetching jobs from Indeed...")
-                logging.info(f"Parameters - Title: {job_title}, Location: {location}, Pages: {num_pages}")
-                jobs_from_indeed = scrape_indeed_jobs(job_title, location, num_pages)
-                if jobs_from_indeed:
-                    logging.info(f"Found {len(jobs_from_indeed)} jobs from Indeed")
-                    all_jobs.extend(jobs_from_indeed)
-                else:
-                    logging.warning("No jobs found from Indeed")
-            except Exception as e:
-                logging.error(f"Error fetching Indeed jobs: {str(e)}")
-                logging.error(traceback.format_exc())
-
-        # Fetch jobs from LinkedIn
-        if include_linkedin:
-            try:
-                logging.info("Fetching jobs from LinkedIn...")
-                logging.info(f"Parameters - Title: {job_title}, Location: {location}, Pages: {num_pages}")
-                jobs_from_linkedin = scrape_linkedin_jobs(job_title, location, num_pages)
-                if jobs_from_linkedin:
-                    logging.info(f"Found {len(jobs_from_linkedin)} jobs from LinkedIn")
-                    all_jobs.extend(jobs_from_linkedin)
-                else:
-                    logging.warning("No jobs found from LinkedIn")
-            except Exception as e:
-                logging.error(f"Error fetching LinkedIn jobs: {str(e)}")
-                logging.error(traceback.format_exc())
+        try:
+            search = parse_search_request(request.json)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        # Add similarity scores to each job
-        for job in all_jobs:
-            job_description = job.get("Description", "")
-            tfidf_score = calculate_similarity_tfidf(resume, job_description) if job_description else 0.0
-            job["Similarity Score"] = round(tfidf_score, 4)
+        # With top_k, answer from the local job store; scraping only tops it up
+        if search["top_k"]:
+            stored_jobs = search_job_store(search)
+            if len(stored_jobs) >= search["top_k"]:
+                schedule_store_top_up(search)
+                return jsonify(stored_jobs), 200
+            logging.info(f"Only {len(stored_jobs)} stored postings match the search, falling back to a live search")
 
-        # Sort jobs by similarity score (highest to lowest)
-        sorted_jobs = sorted(all_jobs, key=lambda x: x["Similarity Score"], reverse=True)
+        # Fetch every page from every enabled source in parallel
+        logging.info(f"Fetching jobs from {', '.join(search['sources']) or 'no sources'}...")
+        logging.info(f"Parameters - Title: {search['job_title']}, Location: {search['location']}, Pages: {search['num_pages']}")
+        all_jobs = JobBatch.from_dicts(
+            fetch_jobs(search["job_title"], search["location"], search["num_pages"], search["sources"])
+        ).drop_duplicates()
+        if len(all_jobs):
+            logging.info(f"Found {len(all_jobs)} jobs")
+        else:
+            logging.warning("No jobs found")
 
-        return jsonify(sorted_jobs), 200
+        ingest_jobs(all_jobs)
+        score_jobs(search["resume"], all_jobs, search["scoring"])
+        return jsonify(rank_jobs(all_jobs, search["top_k"]).to_dicts()), 200
 
     except Exception as e:
         exc_type, exc_value, exc_traceback = sys.exc_info()
@@ -95,6 +226,179 @@ def recommend_jobs():
         logging.error("Exception traceback: %s", traceback.format_exc())
         return jsonify({"error": f"An internal error occurred: {str(e)}"}), 500
 
+def run_live_search(search):
+    """
+    Scrape a search page by page, as the streaming and queued endpoints do.
+
+    Each page is deduplicated against the pages before it, ingested and
+    scored as soon as it arrives. Once every page is in, all jobs are scored
+    again, because the IDF model kept learning from each page.
+    Args:
+        search (dict): Parameters from parse_search_request.
+    Yields:
+        tuple: ("page", source, page, batch) for every page, ranked, then
+        ("summary", None, None, batch) with every job ranked.
+    """
+    batches = []
+    deduplicator = JobDeduplicator()
+    pages = iter_job_pages(search["job_title"], search["location"], search["num_pages"], search["sources"])
+    for source, page, jobs in pages:
+        batch = JobBatch.from_dicts(jobs).drop_duplicates(deduplicator)
+        ingest_jobs(batch)
+        score_jobs(search["resume"], batch, search["scoring"])
+        batches.append(batch)
+        yield "page", source, page, rank_jobs(batch)
+
+    all_jobs = JobBatch.concat(batches)
+    yield "summary", None, None, rank_jobs(score_jobs(search["resume"], all_jobs, search["scoring"]))
+
+@app.route('/recommend_jobs/stream', methods=['POST'])
+def recommend_jobs_stream():
+    """
+    Streaming variant of /recommend_jobs.
+
+    Responds with newline-delimited JSON: one {"type": "job"} line per scored job
+    as soon as its page arrives, a {"type": "page"} line once a page's jobs are
+    all sent, then a final {"type": "summary"} line with every job ranked. Jobs are re-scored for the summary because the IDF model keeps
+    learning from each page during the search. Each page is deduplicated
+    against the pages before it, so a posting is only scored once. With
+    "columnar": true in the request, the summary carries "columns" (column
+    name -> list of values) instead of "jobs".
+    """
+    try:
+        search = parse_search_request(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def generate():
+        try:
+            for event, source, page, batch in run_live_search(search):
+                if event == "page":
+                    for job in batch.to_dicts():
+                        yield json.dumps({"type": "job", "source": source, "page": page, "job": job}) + "\n"
+                    yield json.dumps({"type": "page", "source": source, "page": page, "count": len(batch)}) + "\n"
+                    continue
+                summary = {"type": "summary", "count": len(batch)}
+                if search["columnar"]:
+                    summary["columns"] = batch.to_columns()
+                else:
+                    summary["jobs"] = batch.to_dicts()
+                yield json.dumps(summary) + "\n"
+        except Exception as e:
+            logging.error(f"An error occurred while streaming: {str(e)}")
+            logging.error("Exception traceback: %s", traceback.format_exc())
+            yield json.dumps({"type": "error", "error": f"An internal error occurred: {str(e)}"}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def run_queued_search(handle):
+    """
+    Worker body for the search queue: publish each scored page as partial
+    results, then return the final ranking.
+    """
+    for event, source, page, batch in run_live_search(handle.params):
+        if event == "page":
+            handle.add_partial_results(batch.to_dicts())
+        else:
+            return batch.to_dicts()
+
+# Background workers for the submit-and-poll API
+search_queue = SearchQueue(
+    run_queued_search,
+    workers=int(os.getenv("SEARCH_WORKERS", "4")),
+    max_pending=int(os.getenv("SEARCH_QUEUE_SIZE", "32")),
+    retention=float(os.getenv("SEARCH_RETENTION", "3600")),
+)
+
+@app.route('/searches', methods=['POST'])
+def submit_search():
+    """
+    Queue a search and return its ID immediately (202).
+
+    Accepts the /recommend_jobs payload. Responds 429 with Retry-After when the
+    queue is full.
+    """
+    try:
+        search = parse_search_request(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        search_id = search_queue.submit(search)
+    except SearchQueueFull as e:
+        response = jsonify({"error": str(e)})
+        response.headers["Retry-After"] = "5"
+        return response, 429
+
+    logging.info(f"Queued search {search_id} ({search_queue.pending_count()} waiting)")
+    return jsonify({"search_id": search_id, "status": "queued", "status_url": f"/searches/{search_id}"}), 202
+
+@app.route('/searches/<search_id>', methods=['GET'])
+def get_search(search_id):
+    """
+    Status, partial results and final ranking of a queued search.
+
+    Pass ?since=<version>&wait=<seconds> to long-poll: the request returns as
+    soon as the search has changed after that version, or when it times out.
+    """
+    handle = search_queue.get(search_id)
+    if handle is None:
+        return jsonify({"error": "Unknown search ID"}), 404
+
+    wait = min(request.args.get("wait", 0, type=float), 30.0)
+    if wait > 0:
+        handle.wait_for_change(request.args.get("since", -1, type=int), wait)
+
+    return jsonify(handle.snapshot()), 200
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """
+    Cheap liveness check for the server supervisor and load balancers.
+    """
+    return jsonify({
+        "status": "ok",
+        "pid": os.getpid(),
+        "idf_documents": idf_model.num_documents,
+        "searches_waiting": search_queue.pending_count(),
+    }), 200
+
+def preload_models():
+    """
+    Load the shared read-only models: the IDF model (already mapped at import),
+    the pre-trained Doc2Vec model and, with TEXT_TOKENIZER=spacy, the spaCy
+    tokenizer. The production server calls this before forking workers so
+    they all share one copy of each. Nothing here may open a SQLite store:
+    connections must not cross a fork, so each worker opens its own on first
+    use (the job store, and with it the saved job indexes, included).
+    """
+    start = time.perf_counter()
+    doc2vec_model = get_doc2vec_model()
+    if TEXT_TOKENIZER == "spacy":
+        get_nlp()
+    logging.info(
+        f"Preloaded models in {time.perf_counter() - start:.2f}s "
+        f"(IDF documents: {idf_model.num_documents}, Doc2Vec: {'yes' if doc2vec_model is not None else 'no'})"
+    )
+
+def shutdown_services(timeout=None):
+    """
+    Drain background work before the process exits: queued searches get up to
+    `timeout` seconds to finish, then store top-ups are cancelled, pooled
+    browsers quit and unsaved IDF model updates are written.
+    """
+    if not search_queue.shutdown(timeout):
+        logging.warning("Shutting down with searches still running")
+    if _top_up_executor is not None:
+        _top_up_executor.shutdown(wait=False, cancel_futures=True)
+    shutdown_driver_pool()
+    try:
+        idf_model.save_if_due(0)
+    except Exception as e:
+        logging.error(f"Error saving IDF model: {str(e)}")
+
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5004)
\ No newline at end of file
+    # Development server; use `gunicorn -c gunicorn.conf.py wsgi:application` in production
+    app.run(debug=os.getenv("FLASK_DEBUG", "true").lower() == "true", host="0.0.0.0", port=int(os.getenv("BACKEND_PORT", "5004")))
\ No newline at end of file
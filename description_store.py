@@ -0,0 +1,160 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from storage import DATA_DIR
+
+# SQLite file holding fetched descriptions, and how long a fetched description stays fresh
+DESCRIPTION_STORE_DB = os.getenv("DESCRIPTION_STORE_DB", os.path.join(DATA_DIR, "descriptions.db"))
+DESCRIPTION_CACHE_TTL = float(os.getenv("DESCRIPTION_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+# Query parameters that only track where a click came from; anything else
+# (Indeed's jk, for instance) may identify the posting and is kept
+TRACKING_PARAMETERS = frozenset((
+    "trk", "trkinfo", "refid", "trackingid", "lipi", "midtoken", "midsig", "eid", "originalsubdomain",
+    "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "from", "tk", "ref", "src",
+))
+
+
+def _is_tracking_parameter(name):
+    name = name.lower()
+    return name.startswith("utm_") or name in TRACKING_PARAMETERS
+
+
+def normalize_job_url(url):
+    """
+    Canonical form of a job posting URL, used as the store key.
+
+    Scheme and host are lowercased, "www." and LinkedIn country subdomains are
+    dropped, fragments, trailing slashes and tracking parameters (utm_*, trk,
+    refId, trackingId, ...) removed, and the remaining parameters sorted.
+    """
+    if not url or url == "N/A":
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(".linkedin.com"):
+        host = "linkedin.com"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_parameter(name)
+    ))
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, query, ""))
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DescriptionStore:
+    """
+    Persistent store of job descriptions keyed by normalized posting URL.
+
+    Each row keeps the description text, when it was fetched and a hash of the
+    content, so a posting's description is only fetched again once it is
+    older than the TTL.
+    """
+
+    def __init__(self, path=DESCRIPTION_STORE_DB, ttl=DESCRIPTION_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS descriptions ("
+                "url TEXT PRIMARY KEY, description TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, content_hash TEXT NOT NULL)"
+            )
+
+    def get(self, url):
+        """
+        Return the stored description for a posting if it is still fresh, else None.
+        """
+        return self.get_many([url]).get(normalize_job_url(url))
+
+    def get_many(self, urls):
+        """
+        Look up several postings at once.
+        Returns:
+            dict: Normalized URL -> description, for fresh entries only.
+        """
+        keys = list({key for key in map(normalize_job_url, urls) if key})
+        if not keys:
+            return {}
+        oldest = time.time() - self.ttl
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT url, description FROM descriptions "
+                    f"WHERE fetched_at > ? AND url IN ({','.join('?' * len(chunk))})",
+                    [oldest] + chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, items, fetched_at=None):
+        """
+        Store descriptions.
+        Args:
+            items (iterable[tuple]): (url, description) pairs; empty ones are skipped.
+            fetched_at (float, optional): Fetch timestamp, defaults to now.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [
+            (normalize_job_url(url), description, fetched_at, content_hash(description))
+            for url, description in items
+            if normalize_job_url(url) and description
+        ]
+        if not rows:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO descriptions (url, description, fetched_at, content_hash) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def put(self, url, description, fetched_at=None):
+        self.put_many([(url, description)], fetched_at)
+
+    def iter_descriptions(self):
+        """
+        Yield every stored description, e.g. to build models over the corpus.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT description FROM descriptions").fetchall()
+        for (description,) in rows:
+            yield description
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_description_store():
+    """
+    Return the process-wide description store, opening it on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DescriptionStore()
+    return _store
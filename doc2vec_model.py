@@ -0,0 +1,108 @@
+import logging
+import os
+import threading
+
+import numpy as np
+
+from storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Where the pre-trained model is saved and loaded from
+DOC2VEC_MODEL_PATH = os.getenv("DOC2VEC_MODEL_PATH", os.path.join(DATA_DIR, "doc2vec", "doc2vec.model"))
+
+
+def build_doc2vec_model(token_lists, model_path=DOC2VEC_MODEL_PATH, vector_size=100, window=5,
+                        min_count=2, epochs=20, workers=4):
+    """
+    Train a Doc2Vec model offline on a job-description corpus and save it.
+
+    Large arrays are saved as separate .npy files so the model can later be
+    loaded memory-mapped.
+    Args:
+        token_lists (list[list[str]]): One token list per job description.
+        model_path (str): Destination file.
+    Returns:
+        Doc2Vec: The trained model.
+    """
+    from gensim.models.doc2vec import Doc2Vec, TaggedDocument
+
+    documents = [TaggedDocument(words=tokens, tags=[i]) for i, tokens in enumerate(token_lists) if tokens]
+    if not documents:
+        raise ValueError("Cannot build a Doc2Vec model from an empty corpus")
+
+    model = Doc2Vec(
+        vector_size=vector_size,
+        window=window,
+        min_count=min_count,
+        workers=workers,
+        epochs=epochs,
+        seed=42  # Fixed seed for reproducibility
+    )
+    model.build_vocab(documents)
+    model.train(documents, total_examples=model.corpus_count, epochs=model.epochs)
+
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    model.save(model_path, sep_limit=0)
+    logger.info(f"Saved Doc2Vec model trained on {len(documents)} documents to {model_path}")
+    return model
+
+
+def load_doc2vec_model(model_path=DOC2VEC_MODEL_PATH):
+    """
+    Load a saved Doc2Vec model with its arrays memory-mapped read-only.
+    Returns:
+        Doc2Vec or None: None when no model has been built yet.
+    """
+    if not os.path.exists(model_path):
+        return None
+    from gensim.models.doc2vec import Doc2Vec
+
+    model = Doc2Vec.load(model_path, mmap="r")
+    logger.info(f"Loaded Doc2Vec model from {model_path}")
+    return model
+
+
+_model = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_doc2vec_model():
+    """
+    Return the process-wide pre-trained Doc2Vec model, loading it on first use.
+    Returns None when no model has been built.
+    """
+    global _model, _model_loaded
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                _model = load_doc2vec_model()
+                _model_loaded = True
+    return _model
+
+
+def infer_vectors(model, token_lists):
+    """
+    Infer L2-normalized vectors for many documents with a trained model.
+    Returns:
+        numpy.ndarray: One row per document; empty documents get a zero row.
+    """
+    vectors = np.zeros((len(token_lists), model.vector_size), dtype=np.float32)
+    for i, tokens in enumerate(token_lists):
+        if tokens:
+            vectors[i] = model.infer_vector(tokens)
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1.0
+    return vectors / norms[:, None]
+
+
+if __name__ == "__main__":
+    # Rebuild the model from every job description collected so far
+    from description_store import get_description_store
+    from text_processing import tokenize_many
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Same tokens the scorers feed to infer_vector
+    corpus = tokenize_many(list(get_description_store().iter_descriptions()))
+    build_doc2vec_model(corpus)
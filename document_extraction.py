@@ -0,0 +1,135 @@
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ("pdf", "docx", "txt")
+
+# Uploads larger than this are rejected; pages past the cap are ignored
+MAX_DOCUMENT_BYTES = int(os.getenv("MAX_DOCUMENT_BYTES", str(10 * 1024 * 1024)))
+MAX_DOCUMENT_PAGES = int(os.getenv("MAX_DOCUMENT_PAGES", "50"))
+
+# PDFs with at least this many pages are split across worker processes
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PARALLEL_PAGE_THRESHOLD", "16"))
+EXTRACTION_WORKERS = int(os.getenv("DOCUMENT_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Number of extracted documents kept, keyed by a hash of their bytes
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "64"))
+
+
+class DocumentExtractionError(ValueError):
+    """Raised for documents that cannot be extracted: unsupported, too large or unreadable."""
+
+
+def _pdf_page_texts(data, start, stop):
+    # Runs in worker processes too, so it parses the PDF from bytes itself
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Spawned workers, since callers (Flask, Streamlit) are multi-threaded
+                _executor = ProcessPoolExecutor(
+                    max_workers=EXTRACTION_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+
+def extract_pdf_text(data, max_pages=MAX_DOCUMENT_PAGES):
+    """
+    Text of a PDF's first max_pages pages, one line break between pages.
+    Long documents are extracted as page ranges in parallel worker processes.
+    """
+    from PyPDF2 import PdfReader
+
+    try:
+        num_pages = min(len(PdfReader(io.BytesIO(data)).pages), max_pages)
+    except Exception as e:
+        raise DocumentExtractionError(f"Could not read PDF: {str(e)}")
+
+    if num_pages < PARALLEL_PAGE_THRESHOLD or EXTRACTION_WORKERS < 2:
+        pages = _pdf_page_texts(data, 0, num_pages)
+    else:
+        chunk_size = -(-num_pages // EXTRACTION_WORKERS)
+        ranges = [(start, min(start + chunk_size, num_pages)) for start in range(0, num_pages, chunk_size)]
+        executor = _get_executor()
+        futures = [executor.submit(_pdf_page_texts, data, start, stop) for start, stop in ranges]
+        pages = [text for future in futures for text in future.result()]
+    return "\n".join(pages)
+
+
+def extract_docx_text(data):
+    """
+    Paragraph text of a Word document.
+    """
+    import docx
+
+    try:
+        document = docx.Document(io.BytesIO(data))
+    except Exception as e:
+        raise DocumentExtractionError(f"Could not read DOCX: {str(e)}")
+    return "\n".join(paragraph.text for paragraph in document.paragraphs)
+
+
+_documents = TTLCache(maxsize=DOCUMENT_CACHE_SIZE)
+
+
+def extract_text(data, filename):
+    """
+    Extract the text of a PDF, DOCX or TXT document.
+
+    Results are cached by a hash of the file's bytes, so re-uploads and
+    Streamlit reruns of the same file skip extraction.
+    Args:
+        data (bytes): File contents.
+        filename (str): Used for its extension.
+    Returns:
+        str: Extracted text, stripped.
+    Raises:
+        DocumentExtractionError: For unsupported, oversized or unreadable files.
+    """
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise DocumentExtractionError("Unsupported file format. Please upload a PDF, DOCX, or TXT file.")
+    if len(data) > MAX_DOCUMENT_BYTES:
+        raise DocumentExtractionError(
+            f"File is too large ({len(data) // 1024} KB); the limit is {MAX_DOCUMENT_BYTES // 1024} KB."
+        )
+
+    key = (extension, hashlib.sha256(data).hexdigest())
+    text = _documents.get(key)
+    if text is None:
+        if extension == "pdf":
+            text = extract_pdf_text(data)
+        elif extension == "docx":
+            text = extract_docx_text(data)
+        else:
+            text = data.decode("utf-8", errors="replace")
+        text = text.strip()
+        _documents.set(key, text)
+    return text
+
+
+def extract_text_from_upload(uploaded_file):
+    """
+    Extract text from an uploaded file object (e.g. Streamlit's UploadedFile).
+    """
+    data = uploaded_file.getvalue() if hasattr(uploaded_file, "getvalue") else uploaded_file.read()
+    return extract_text(data, uploaded_file.name)
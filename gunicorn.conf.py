@@ -0,0 +1,60 @@
+"""
+Gunicorn settings for the JobGenie API. Every value can be overridden from
+the environment, e.g. GUNICORN_THREADS=32.
+
+The server always runs exactly one worker process, because some state is
+per process: the IDF model each worker saves (the last writer would win),
+queued searches (POST /searches, polled with GET /searches/<id>) and the
+coalescing of identical in-flight searches. The master hands each
+connection to whichever worker accepts it, so with more workers polls
+would land on workers that never saw the search and get a 404. Scale with
+GUNICORN_THREADS, or with more servers behind a load balancer that routes
+each client to one of them.
+"""
+import gc
+import os
+
+bind = f"{os.getenv('BACKEND_HOST', '0.0.0.0')}:{os.getenv('BACKEND_PORT', '5004')}"
+
+# Threads serve requests that mostly wait on the network (scraping, streams,
+# long polls); the single worker is checked in on_starting
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# Import the app (and preload the models, see wsgi.py) before forking workers
+preload_app = True
+
+# Live searches and long polls can run for minutes
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "330"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycling a worker drops its queued searches, so it is off by default; set
+# GUNICORN_MAX_REQUESTS if slow leaks (e.g. from browsers) become a problem
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+accesslog = "-"
+
+
+def on_starting(server):
+    # Catches -w/--workers and GUNICORN_CMD_ARGS, which override the value above
+    if server.cfg.workers != 1 or os.getenv("GUNICORN_WORKERS", "1") != "1":
+        raise RuntimeError(
+            "The JobGenie API must run a single Gunicorn worker (see gunicorn.conf.py); "
+            "raise GUNICORN_THREADS instead"
+        )
+
+
+def when_ready(server):
+    # Move the preloaded objects out of the garbage collector's reach, so
+    # collections in the workers do not touch (and copy) their pages
+    gc.freeze()
+
+
+def worker_exit(server, worker):
+    from app import shutdown_services
+
+    # Leave a few seconds of the graceful timeout for the rest of the cleanup
+    shutdown_services(timeout=max(graceful_timeout - 5, 0))
@@ -0,0 +1,341 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from storage import DATA_DIR
+from text_processing import get_token_streams, normalize
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the persisted model files
+IDF_MODEL_DIR = os.getenv("IDF_MODEL_DIR", os.path.join(DATA_DIR, "idf"))
+
+VOCABULARY_FILE = "vocabulary.txt"
+DOCUMENT_FREQUENCY_FILE = "document_frequency.npy"
+SEEN_DOCUMENTS_FILE = "seen_documents.npy"
+META_FILE = "meta.json"
+# Names the version directory in use; replacing it is what makes a save visible
+CURRENT_FILE = "CURRENT"
+
+# Minimum seconds between saves of a model that keeps changing (see save_if_due)
+IDF_SAVE_INTERVAL = float(os.getenv("IDF_SAVE_INTERVAL", "60"))
+
+
+def _read_current(model_dir):
+    try:
+        with open(os.path.join(model_dir, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _move_aside(model_dir, version_dir):
+    target = os.path.join(model_dir, f"unreadable-{time.time_ns()}")
+    if os.path.exists(version_dir):
+        os.replace(version_dir, target)
+    # The next save switches CURRENT to a new version
+    try:
+        os.remove(os.path.join(model_dir, CURRENT_FILE))
+    except FileNotFoundError:
+        pass
+    return target
+
+
+def _remove_old_versions(model_dir, keep):
+    # The previous version is kept too: another process may still have it memory-mapped
+    for name in os.listdir(model_dir):
+        if name.startswith("v") and name not in keep and os.path.isdir(os.path.join(model_dir, name)):
+            shutil.rmtree(os.path.join(model_dir, name), ignore_errors=True)
+
+
+def document_hash(text):
+    """
+    Stable 64-bit hash of a document, used to avoid counting it twice.
+    """
+    digest = hashlib.blake2b(normalize(text).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class IdfModel:
+    """
+    Long-lived IDF/vocabulary model fitted on every job description seen so far.
+
+    The model keeps a vocabulary, per-term document frequencies and the hashes of
+    the documents already counted. It is updated incrementally with partial_fit,
+    saved as a versioned directory holding a plain-text vocabulary plus NumPy
+    arrays, and loaded with the arrays memory-mapped so startup cost does not
+    grow with the corpus size.
+    """
+
+    def __init__(self, model_dir=IDF_MODEL_DIR):
+        self.model_dir = model_dir
+        # Identity of this model across its saved versions; a model started
+        # from scratch gets a new one, so vectors built with another model are
+        # not mistaken for its own
+        self.model_id = uuid.uuid4().hex
+        self.vocabulary = {}
+        self.document_frequency = np.zeros(0, dtype=np.uint32)
+        self.num_documents = 0
+        # Sorted hashes loaded from disk plus hashes added since the last save
+        self._seen_sorted = np.zeros(0, dtype=np.uint64)
+        self._seen_new = set()
+        self._idf = None
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        # Bumped on every update, so cached vectors can tell when weights changed
+        self.version = 0
+        self._saved_version = 0
+        self._last_save = float("-inf")
+
+    @classmethod
+    def load(cls, model_dir=IDF_MODEL_DIR):
+        """
+        Load the current saved version, memory-mapping its arrays. Returns an
+        empty model if nothing has been saved yet. A version that cannot be
+        read is moved aside (never saved over) and an empty model returned.
+        """
+        model = cls(model_dir)
+        name = _read_current(model_dir)
+        if name is None:
+            return model
+        version_dir = os.path.join(model_dir, name)
+
+        try:
+            with open(os.path.join(version_dir, META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(os.path.join(version_dir, VOCABULARY_FILE), "r", encoding="utf-8") as f:
+                terms = f.read().split("\n")
+            if terms and terms[-1] == "":
+                terms.pop()
+
+            model.vocabulary = {term: index for index, term in enumerate(terms)}
+            model.document_frequency = np.load(os.path.join(version_dir, DOCUMENT_FREQUENCY_FILE), mmap_mode="r")
+            model._seen_sorted = np.load(os.path.join(version_dir, SEEN_DOCUMENTS_FILE), mmap_mode="r")
+            model.num_documents = int(meta["num_documents"])
+            model.model_id = str(meta["model_id"])
+
+            if not len(model.vocabulary) == len(model.document_frequency) == int(meta["num_terms"]):
+                raise ValueError("vocabulary and document frequency sizes differ")
+        except Exception as e:
+            moved_to = _move_aside(model_dir, version_dir)
+            logger.error(f"Could not load IDF model from {version_dir}, moved it to {moved_to} and starting empty: {e}")
+            return cls(model_dir)
+
+        model._saved_version = model.version
+        logger.info(f"Loaded IDF model: {model.num_documents} documents, {len(model.vocabulary)} terms")
+        return model
+
+    def save(self):
+        """
+        Write the model as a new version directory and switch CURRENT to it
+        with a single rename, so a crash at any point leaves the previous
+        version in use. Only taking the snapshot holds the model lock; the
+        files are written without it, so scoring does not wait on the disk.
+        """
+        with self._save_lock:
+            with self._lock:
+                # Terms are indexed in insertion order, and partial_fit replaces
+                # document_frequency instead of writing into it
+                terms = list(self.vocabulary)
+                document_frequency = self.document_frequency
+                num_documents = self.num_documents
+                model_id = self.model_id
+                seen_sorted = self._seen_sorted
+                seen_new = list(self._seen_new)
+                version = self.version
+
+            seen = seen_sorted
+            if seen_new:
+                seen = np.union1d(seen_sorted, np.asarray(seen_new, dtype=np.uint64))
+            seen = np.asarray(seen, dtype=np.uint64)
+
+            name = f"v{time.time_ns()}-{os.getpid()}"
+            version_dir = os.path.join(self.model_dir, name)
+            os.makedirs(version_dir)
+            with open(os.path.join(version_dir, VOCABULARY_FILE), "wb") as f:
+                f.write("".join(term + "\n" for term in terms).encode("utf-8"))
+            with open(os.path.join(version_dir, DOCUMENT_FREQUENCY_FILE), "wb") as f:
+                np.save(f, np.asarray(document_frequency, dtype=np.uint32))
+            with open(os.path.join(version_dir, SEEN_DOCUMENTS_FILE), "wb") as f:
+                np.save(f, seen)
+            with open(os.path.join(version_dir, META_FILE), "w", encoding="utf-8") as f:
+                json.dump({"model_id": model_id, "num_documents": num_documents, "num_terms": len(terms)}, f)
+
+            current_path = os.path.join(self.model_dir, CURRENT_FILE)
+            previous = _read_current(self.model_dir)
+            with open(f"{current_path}.{os.getpid()}.tmp", "w", encoding="utf-8") as f:
+                f.write(name)
+            os.replace(f"{current_path}.{os.getpid()}.tmp", current_path)
+            _remove_old_versions(self.model_dir, keep=(name, previous))
+
+            with self._lock:
+                self._seen_sorted = seen
+                self._seen_new.difference_update(seen_new)
+                self._saved_version = version
+                self._last_save = time.monotonic()
+
+    def save_if_due(self, min_interval=IDF_SAVE_INTERVAL):
+        """
+        Save when there are unsaved updates and the last save is at least
+        min_interval seconds old.
+        Returns:
+            bool: Whether the model was saved.
+        """
+        with self._lock:
+            due = self.version != self._saved_version and time.monotonic() - self._last_save >= min_interval
+        if due:
+            self.save()
+        return due
+
+    def _has_seen(self, doc_hash):
+        if doc_hash in self._seen_new:
+            return True
+        position = np.searchsorted(self._seen_sorted, np.uint64(doc_hash))
+        return position < len(self._seen_sorted) and self._seen_sorted[position] == doc_hash
+
+    def partial_fit(self, documents):
+        """
+        Add new documents to the corpus statistics.
+        Args:
+            documents (list[str]): Job descriptions. Empty texts and documents
+                already counted are skipped.
+        Returns:
+            int: Number of documents that were added.
+        """
+        with self._lock:
+            term_counts = Counter()
+            added = 0
+            documents = [text for text in documents if text]
+            for text, stream in zip(documents, get_token_streams(documents)):
+                doc_hash = document_hash(text)
+                if self._has_seen(doc_hash):
+                    continue
+                self._seen_new.add(doc_hash)
+                added += 1
+
+                for term in set(stream.tokens):
+                    index = self.vocabulary.get(term)
+                    if index is None:
+                        index = len(self.vocabulary)
+                        self.vocabulary[term] = index
+                    term_counts[index] += 1
+
+            if not added:
+                return 0
+
+            # Memory-mapped arrays are read-only, so grow into a fresh array
+            document_frequency = np.zeros(len(self.vocabulary), dtype=np.uint32)
+            document_frequency[:len(self.document_frequency)] = self.document_frequency
+            if term_counts:
+                indices = np.fromiter(term_counts.keys(), dtype=np.int64, count=len(term_counts))
+                counts = np.fromiter(term_counts.values(), dtype=np.uint32, count=len(term_counts))
+                document_frequency[indices] += counts
+
+            self.document_frequency = document_frequency
+            self.num_documents += added
+            self._idf = None
+            self.version += 1
+            return added
+
+    @property
+    def idf(self):
+        """
+        Smoothed IDF weights, computed the same way as TfidfVectorizer.
+        """
+        with self._lock:
+            if self._idf is None:
+                document_frequency = np.asarray(self.document_frequency, dtype=np.float64)
+                self._idf = np.log((1.0 + self.num_documents) / (1.0 + document_frequency)) + 1.0
+            return self._idf
+
+    def transform(self, documents):
+        """
+        Turn texts into L2-normalized TF-IDF rows. Terms outside the vocabulary
+        are ignored.
+        Returns:
+            scipy.sparse.csr_matrix: One row per document.
+        """
+        return self.transform_tokens([stream.tokens for stream in get_token_streams(documents)])
+
+    def transform_tokens(self, token_lists):
+        """
+        Same as transform, for documents that are already tokenized.
+        """
+        indptr = [0]
+        indices = []
+        values = []
+        # Hold the lock so a concurrent partial_fit cannot grow the vocabulary
+        # past the IDF vector captured here
+        with self._lock:
+            vocabulary = self.vocabulary
+            idf = self.idf
+            for tokens in token_lists:
+                counts = Counter(vocabulary[term] for term in tokens if term in vocabulary)
+                indices.extend(counts.keys())
+                values.extend(counts.values())
+                indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(token_lists), len(idf)),
+        )
+        matrix = matrix.multiply(idf).tocsr()
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ matrix
+
+    def score(self, resume, job_descriptions, resume_vector=None):
+        """
+        Cosine similarity between the resume and each job description.
+        Args:
+            resume (str): Resume text.
+            job_descriptions (list[str]): Job description texts.
+            resume_vector (scipy.sparse matrix, optional): Precomputed transform
+                of the resume, e.g. from the resume cache.
+        Returns:
+            list[float]: One score per description, 0.0 for empty descriptions.
+        """
+        if not resume or not job_descriptions:
+            return [0.0] * len(job_descriptions)
+        if resume_vector is None:
+            resume_vector = self.transform([resume])
+        matrix = self.transform(job_descriptions)
+
+        # The vocabulary may have grown between the two transforms; new columns
+        # are empty in whichever matrix predates them
+        width = max(matrix.shape[1], resume_vector.shape[1])
+        matrix = sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width))
+        resume_vector = sparse.csr_matrix(
+            (resume_vector.data, resume_vector.indices, resume_vector.indptr), shape=(1, width)
+        )
+        similarities = (matrix @ resume_vector.T).toarray().ravel()
+        return [float(similarity) for similarity in similarities]
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_idf_model():
+    """
+    Return the process-wide IDF model, loading it from disk on first use.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = IdfModel.load()
+                # Updates since the last throttled save are written on exit
+                atexit.register(_model.save_if_due, 0)
+    return _model
@@ -0,0 +1,70 @@
+"""
+Measure how long the backend modules take to import in a fresh interpreter.
+
+Each module is imported in its own subprocess several times; the median wall
+time is reported along with the slowest imports from `python -X importtime`.
+
+    python import_benchmark.py [module ...] [--runs N] [--top N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = ["app", "job_search", "similarity_score", "resumerec"]
+
+
+def time_import(module, runs):
+    """
+    Median and minimum wall-clock seconds to start Python and import a module.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), min(timings)
+
+
+def slowest_imports(module, top):
+    """
+    The module's direct imports that took longest, as (cumulative microseconds, name).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indent><name>", indented by nesting depth
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        # Deeper imports are already counted in their importer's cumulative time
+        if depth == 1:
+            entries.append((int(cumulative_us), name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    baseline, _ = time_import("sys", args.runs)
+    print(f"Interpreter startup: {baseline * 1000:.0f} ms")
+    for module in args.modules:
+        median, best = time_import(module, args.runs)
+        print(f"\nimport {module}: median {median * 1000:.0f} ms, best {best * 1000:.0f} ms "
+              f"({(median - baseline) * 1000:.0f} ms over startup)")
+        for cumulative_us, name in slowest_imports(module, args.top):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import http.client
+import json
+import logging
+import queue
+import random
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class JobSearchClient:
+    """
+    Client for the RapidAPI LinkedIn job search endpoint.
+
+    Connections are kept alive and reused from a bounded pool, so a steady
+    stream of searches uses at most max_connections sockets and pays the TCP
+    and TLS handshake once per connection instead of once per page. Requests
+    that hit 429/5xx, fail to connect, or find a kept-alive socket already
+    closed by the server are retried with jittered exponential backoff. A
+    request that times out waiting for the response is not sent again, since
+    the API may already have run (and billed) it. Call close() (or use the client as a context manager)
+    to release the sockets.
+    """
+
+    def __init__(self, host, api_key=None, scheme="https", port=None, max_connections=4,
+                 timeout=15.0, max_retries=3, backoff_base=0.5, backoff_max=8.0):
+        if not host:
+            raise ValueError("A job search API host is required")
+        self.host = host
+        self.api_key = api_key
+        self.scheme = scheme
+        self.port = port
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _new_connection(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self):
+        if self._closed:
+            raise RuntimeError("JobSearchClient has been closed")
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def _release(self, connection, reusable):
+        try:
+            if reusable and not self._closed:
+                self._idle.put(connection)
+            else:
+                connection.close()
+        finally:
+            self._slots.release()
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        # Full jitter keeps many clients from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        Send a request over a pooled connection, retrying transient failures.
+        Args:
+            method (str): HTTP method.
+            path (str): Request path.
+            body (str or bytes, optional): Request body.
+            headers (dict, optional): Extra headers; the RapidAPI headers are added.
+        Returns:
+            tuple: (status code, response body bytes) of the last attempt.
+        """
+        request_headers = {
+            "x-rapidapi-key": self.api_key,
+            "x-rapidapi-host": self.host,
+            "Content-Type": "application/json",
+        }
+        request_headers.update(headers or {})
+
+        for attempt in range(self.max_retries + 1):
+            connection, reused = self._acquire()
+            try:
+                if connection.sock is None:
+                    connection.connect()
+            except OSError as e:
+                # Nothing has been sent yet, so a failed connect is always safe to retry
+                self._release(connection, reusable=False)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Could not connect to the job search API ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            try:
+                connection.request(method, path, body, request_headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                self._release(connection, reusable=False)
+                # Only an idle keep-alive socket the server already closed is retried;
+                # otherwise (a read timeout above all) the request may have been processed
+                if not reused or isinstance(e, socket.timeout) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Job search request failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            self._release(connection, reusable=not response.will_close)
+            if response.status in RETRYABLE_STATUSES and attempt < self.max_retries:
+                delay = self._backoff(attempt, response.getheader("Retry-After"))
+                logger.warning(f"Job search API returned {response.status}, retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            return response.status, data
+
+    def search(self, search_terms, location, page=1):
+        """
+        Run a job search.
+        Returns:
+            tuple: (status code, decoded JSON or None when the status is not 200).
+        """
+        payload = json.dumps({
+            "search_terms": search_terms,
+            "location": location,
+            "page": page
+        })
+        status, data = self.request("POST", "/", payload)
+        if status != 200:
+            return status, None
+        return status, json.loads(data.decode("utf-8"))
+
+    def close(self):
+        """
+        Close all idle connections; connections in use are closed when returned.
+        """
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,276 @@
+import os
+import re
+import zlib
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from description_store import normalize_job_url
+
+# Postings whose descriptions have at least this estimated Jaccard similarity
+# (over word shingles) are treated as the same job
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+# MinHash signature length, split into LSH bands of MINHASH_PERMUTATIONS / MINHASH_BANDS rows
+MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", "128"))
+MINHASH_BANDS = int(os.getenv("MINHASH_BANDS", "32"))
+
+# Words per shingle, and the shortest description worth comparing (placeholders
+# and one-liners would otherwise all look alike)
+SHINGLE_SIZE = int(os.getenv("SHINGLE_SIZE", "3"))
+NEAR_DUPLICATE_MIN_WORDS = int(os.getenv("NEAR_DUPLICATE_MIN_WORDS", "20"))
+
+# Field holding the links of the duplicates merged into a canonical posting
+OTHER_LINKS_FIELD = "Other Links"
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/]*-)?(\d+)")
+
+
+def posting_key(url):
+    """
+    Identity of a posting URL: the job ID for LinkedIn and Indeed links,
+    otherwise the normalized URL. None for missing links.
+    """
+    normalized = normalize_job_url(url)
+    if normalized is None:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if "indeed." in host:
+        query = parse_qs(parts.query)
+        for name in ("jk", "vjk"):
+            if query.get(name):
+                return "indeed:" + query[name][0]
+    elif "linkedin." in host:
+        match = _LINKEDIN_JOB_ID.search(parts.path)
+        if match:
+            return "linkedin:" + match.group(1)
+    return normalized
+
+
+def _listing_key(title, company, location):
+    return tuple(" ".join(str(value).lower().split()) for value in (title, company, location))
+
+
+def _is_indeed_link(link):
+    return bool(link) and "indeed." in urlsplit(str(link).strip()).netloc.lower()
+
+
+class MinHasher:
+    """
+    MinHash signatures of texts over word shingles.
+
+    Each of num_perm universal hash functions (a * x + b mod a Mersenne prime)
+    is applied to the CRC32 of every shingle at once with NumPy, and the
+    signature keeps each function's minimum. The share of equal positions in
+    two signatures estimates the Jaccard similarity of their shingle sets.
+    """
+
+    def __init__(self, num_perm=MINHASH_PERMUTATIONS, shingle_size=SHINGLE_SIZE, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Fixed seed, so signatures are comparable across processes and runs
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        words = _WORD_PATTERN.findall(str(text).lower())
+        size = min(self.shingle_size, len(words))
+        return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)} if words else set()
+
+    def signature(self, text, min_words=NEAR_DUPLICATE_MIN_WORDS):
+        """
+        MinHash signature of a text as a uint32 array, or None when it has fewer than min_words words.
+        """
+        if len(_WORD_PATTERN.findall(str(text).lower())) < max(min_words, 1):
+            return None
+        shingles = self.shingles(text)
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        # uint64 products wrap around, as in the usual 32-bit MinHash formulation
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimate_jaccard(first, second):
+    """
+    Jaccard similarity estimated from two MinHash signatures.
+    """
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures.
+
+    Signatures are cut into bands; two signatures become candidates when any
+    band matches exactly, which happens with high probability above a
+    similarity of roughly (1 / bands) ** (1 / rows).
+    """
+
+    def __init__(self, num_perm=MINHASH_PERMUTATIONS, bands=MINHASH_BANDS):
+        if num_perm % bands:
+            raise ValueError(f"{num_perm} permutations cannot be split into {bands} equal bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = {}
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key, signature):
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def candidates(self, signature):
+        """
+        Keys sharing at least one band with the signature, in insertion order.
+        """
+        found = {}
+        for band_key in self._band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                found[key] = None
+        return list(found)
+
+
+class JobDeduplicator:
+    """
+    Finds repeated postings across pages and sources.
+
+    A posting duplicates an earlier one when it has the same job ID or URL,
+    or a description whose MinHash similarity reaches the threshold
+    (candidates come from LSH, so comparisons stay close to linear). Indeed
+    postings also match earlier Indeed postings with the same (title,
+    company, location), ignoring case and spacing, as the Indeed scraper
+    always has; elsewhere distinct openings often share a listing, so that
+    is left to the descriptions. Keep one instance per search; it is not
+    thread-safe.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=MINHASH_PERMUTATIONS, bands=MINHASH_BANDS):
+        self.threshold = threshold
+        self._hasher = MinHasher(num_perm)
+        self._lsh = LSHIndex(num_perm, bands)
+        self._keys = {}
+        self._signatures = []
+        # Per canonical posting: its link, the list collecting its duplicates'
+        # links, and its job dict (None for rows of a JobBatch)
+        self._links = []
+        self._other_links = []
+        self._jobs = []
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def match(self, link, title, company, location, description):
+        """
+        Look a posting up among the canonical postings seen so far.
+        Returns:
+            tuple: (index, is_new) where index identifies the canonical posting
+            and is_new is True when this posting was just registered as it.
+        """
+        keys = []
+        url_key = posting_key(link)
+        if url_key:
+            keys.append(("url", url_key))
+        if title and title != "N/A" and _is_indeed_link(link):
+            keys.append(("listing",) + _listing_key(title, company, location))
+
+        index = next((self._keys[key] for key in keys if key in self._keys), None)
+        signature = None
+        if index is None and description:
+            signature = self._hasher.signature(description)
+            if signature is not None:
+                index = next((
+                    candidate for candidate in self._lsh.candidates(signature)
+                    if estimate_jaccard(signature, self._signatures[candidate]) >= self.threshold
+                ), None)
+
+        is_new = index is None
+        if is_new:
+            index = len(self._signatures)
+            self._signatures.append(signature)
+            if signature is not None:
+                self._lsh.insert(index, signature)
+        # A duplicate's other keys lead to the same canonical posting from now on
+        for key in keys:
+            self._keys.setdefault(key, index)
+        return index, is_new
+
+    def _register(self, link, other_links, job=None):
+        self._links.append(link)
+        self._other_links.append(other_links)
+        self._jobs.append(job)
+
+    def _merge_links(self, index, links):
+        other_links = self._other_links[index]
+        for link in links:
+            if link and link != "N/A" and link != self._links[index] and link not in other_links:
+                other_links.append(link)
+        job = self._jobs[index]
+        if job is not None and other_links:
+            job[OTHER_LINKS_FIELD] = other_links
+
+    def add_jobs(self, jobs):
+        """
+        Keep the postings not seen before, in order.
+
+        Each duplicate's links are added to the "Other Links" list of its
+        canonical posting (set once there is one), and a canonical posting
+        without a description takes its duplicate's, so it need not be fetched.
+        Args:
+            jobs (list[dict]): Job dictionaries; canonical ones are updated in place.
+        Returns:
+            list[dict]: The new canonical postings.
+        """
+        kept = []
+        for job in jobs:
+            link = job.get("Link", "N/A")
+            index, is_new = self.match(
+                link, job.get("Title", "N/A"), job.get("Company", "N/A"),
+                job.get("Location", "N/A"), job.get("Description", "")
+            )
+            if is_new:
+                self._register(link, [], job)
+                self._merge_links(index, job.get(OTHER_LINKS_FIELD) or ())
+                kept.append(job)
+                continue
+            self._merge_links(index, [link] + list(job.get(OTHER_LINKS_FIELD) or ()))
+            canonical = self._jobs[index]
+            if canonical is not None and not canonical.get("Description") and job.get("Description"):
+                canonical["Description"] = job["Description"]
+        return kept
+
+    def add_batch(self, batch):
+        """
+        JobBatch of the rows not seen before, in order.
+
+        Duplicate links are appended to the canonical row's other_links list,
+        which later takes and concats of its batch share.
+        """
+        keep = []
+        for row in range(len(batch)):
+            link = batch.links[row]
+            index, is_new = self.match(
+                link, batch.titles[row], batch.companies[batch.company_codes[row]],
+                batch.locations[batch.location_codes[row]], batch.descriptions[row]
+            )
+            if is_new:
+                self._register(link, batch.other_links[row])
+                keep.append(row)
+            else:
+                self._merge_links(index, [link] + batch.other_links[row])
+        return batch if len(keep) == len(batch) else batch.take(keep)
+
+
+def deduplicate_jobs(jobs):
+    """
+    Collapse duplicate postings within one list of job dicts; see JobDeduplicator.
+    """
+    return JobDeduplicator().add_jobs(jobs)
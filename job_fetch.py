@@ -0,0 +1,100 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+
+from cache import SingleFlight, make_key
+from job_search import scrape_indeed_page, scrape_linkedin_jobs
+
+logger = logging.getLogger(__name__)
+
+# Page fetchers by source name; each takes (job_title, location, page, deadline=...)
+SOURCES = {
+    "indeed": scrape_indeed_page,
+    "linkedin": scrape_linkedin_jobs,
+}
+
+# Overall time budget for one search, and the cap on concurrent page fetches
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "300"))
+SEARCH_FETCH_WORKERS = int(os.getenv("SEARCH_FETCH_WORKERS", "10"))
+
+
+# Identical page fetches already in progress, shared across concurrent searches
+_inflight_fetches = SingleFlight()
+
+
+def fetch_page(source, job_title, location, page, deadline=None):
+    """
+    Fetch one page from one source, joining an identical fetch that is already
+    in progress instead of starting another.
+
+    Every caller gets its own copies of the job dicts, since scoring annotates
+    them in place for one resume.
+    """
+    key = make_key(source, job_title, location, page)
+    jobs, shared = _inflight_fetches.do(
+        key, lambda: SOURCES[source](job_title, location, page, deadline=deadline)
+    )
+    if shared:
+        logger.info(f"Joined in-flight fetch of {source} page {page} for '{job_title}'")
+    return [dict(job) for job in jobs or []]
+
+
+def iter_job_pages(job_title, location, num_pages=1, sources=("linkedin",), timeout=None):
+    """
+    Fetch pages 1..num_pages from every source at the same time.
+
+    Results are yielded as soon as each page arrives, so callers can merge or
+    stream them. Once the timeout passes, pages not yet started are cancelled
+    and the deadline is passed down so running fetches stop waiting on
+    descriptions.
+    Args:
+        job_title (str): Search term.
+        location (str): Job location.
+        num_pages (int): Number of pages to request from each source.
+        sources (iterable[str]): Keys of SOURCES to query.
+        timeout (float, optional): Seconds before giving up (SEARCH_TIMEOUT).
+    Yields:
+        tuple: (source, page, jobs) for every page that finished in time.
+    """
+    timeout = SEARCH_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    tasks = [(source, page) for source in sources for page in range(1, max(int(num_pages), 1) + 1)]
+    if not tasks:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(len(tasks), SEARCH_FETCH_WORKERS))
+    futures = {
+        executor.submit(fetch_page, source, job_title, location, page, deadline=deadline): (source, page)
+        for source, page in tasks
+    }
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            source, page = futures[future]
+            try:
+                jobs = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching {source} page {page}: {str(e)}")
+                jobs = []
+            logger.info(f"Fetched {len(jobs or [])} jobs from {source} page {page}")
+            yield source, page, jobs or []
+    except FuturesTimeoutError:
+        pending = [futures[future] for future in futures if not future.done()]
+        logger.warning(f"Search timed out after {timeout}s, giving up on {len(pending)} pages: {pending}")
+    finally:
+        # Also runs when the caller stops iterating early
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def fetch_jobs(job_title, location, num_pages=1, sources=("linkedin",), timeout=None):
+    """
+    Fetch and merge every page from every source; see iter_job_pages.
+    Returns:
+        list[dict]: All jobs in arrival order.
+    """
+    all_jobs = []
+    for source, page, jobs in iter_job_pages(job_title, location, num_pages, sources, timeout):
+        all_jobs.extend(jobs)
+    return all_jobs
@@ -0,0 +1,231 @@
+import sys
+
+import numpy as np
+
+from job_dedup import OTHER_LINKS_FIELD, JobDeduplicator
+
+# Columns of a posting as the scrapers, the API and the frontend name them
+JOB_FIELDS = ("Title", "Company", "Location", "Link", "Description")
+SCORE_FIELD = "Similarity Score"
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class JobRecord:
+    """
+    One posting with fixed attributes instead of a dict. Company and location
+    strings are interned, since the same few recur across search results.
+    """
+
+    __slots__ = ("title", "company", "location", "link", "description", "score", "other_links")
+
+    def __init__(self, title="N/A", company="N/A", location="N/A", link="N/A", description="", score=None,
+                 other_links=None):
+        self.title = title
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.link = link
+        self.description = description
+        self.score = score
+        # Links of duplicate postings merged into this one
+        self.other_links = [] if other_links is None else other_links
+
+    @classmethod
+    def from_dict(cls, job):
+        return cls(
+            job.get("Title", "N/A"), job.get("Company", "N/A"), job.get("Location", "N/A"),
+            job.get("Link", "N/A"), job.get("Description") or "", job.get(SCORE_FIELD),
+            list(job.get(OTHER_LINKS_FIELD) or ())
+        )
+
+    def to_dict(self):
+        job = {
+            "Title": self.title,
+            "Company": self.company,
+            "Location": self.location,
+            "Link": self.link,
+            "Description": self.description,
+        }
+        if self.score is not None:
+            job[SCORE_FIELD] = self.score
+        if self.other_links:
+            job[OTHER_LINKS_FIELD] = list(self.other_links)
+        return job
+
+
+class _Encoder:
+    # Dictionary encoding: distinct values in first-seen order, and each value's code
+    def __init__(self, values=()):
+        self.values = []
+        self._codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(_intern(value))
+        return code
+
+
+class JobBatch:
+    """
+    Columnar batch of postings.
+
+    Titles, links and descriptions are lists; company and location are
+    dictionary-encoded as an int32 code per row into a list of distinct
+    values; scores are a float32 array, NaN until scored; other_links holds a
+    list per row of merged duplicates' links. Scoring, ranking and
+    deduplication work on whole columns, and rows become dicts only at the
+    API boundary (to_dicts) or leave as columns (to_columns).
+    """
+
+    def __init__(self, titles, companies, company_codes, locations, location_codes, links, descriptions, scores=None,
+                 other_links=None):
+        self.titles = titles
+        self.companies = companies
+        self.company_codes = np.asarray(company_codes, dtype=np.int32)
+        self.locations = locations
+        self.location_codes = np.asarray(location_codes, dtype=np.int32)
+        self.links = links
+        self.descriptions = descriptions
+        if scores is None:
+            scores = np.full(len(titles), np.nan, dtype=np.float32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.other_links = [[] for _ in titles] if other_links is None else other_links
+
+    @classmethod
+    def from_dicts(cls, jobs):
+        return cls.from_records(JobRecord.from_dict(job) for job in jobs)
+
+    @classmethod
+    def from_records(cls, records):
+        companies, locations = _Encoder(), _Encoder()
+        titles, company_codes, location_codes, links, descriptions, scores, other_links = [], [], [], [], [], [], []
+        for record in records:
+            titles.append(record.title)
+            company_codes.append(companies.code(record.company))
+            location_codes.append(locations.code(record.location))
+            links.append(record.link)
+            descriptions.append(record.description)
+            scores.append(np.nan if record.score is None else record.score)
+            other_links.append(record.other_links)
+        return cls(
+            titles, companies.values, company_codes, locations.values, location_codes, links, descriptions, scores,
+            other_links
+        )
+
+    @classmethod
+    def concat(cls, batches):
+        """
+        One batch holding the rows of every batch in order.
+        """
+        batches = list(batches)
+        companies, locations = _Encoder(), _Encoder()
+        company_codes, location_codes = [], []
+        for batch in batches:
+            company_map = np.array([companies.code(value) for value in batch.companies], dtype=np.int32)
+            location_map = np.array([locations.code(value) for value in batch.locations], dtype=np.int32)
+            company_codes.append(company_map[batch.company_codes] if len(batch) else batch.company_codes)
+            location_codes.append(location_map[batch.location_codes] if len(batch) else batch.location_codes)
+        return cls(
+            [title for batch in batches for title in batch.titles],
+            companies.values, np.concatenate(company_codes) if batches else [],
+            locations.values, np.concatenate(location_codes) if batches else [],
+            [link for batch in batches for link in batch.links],
+            [description for batch in batches for description in batch.descriptions],
+            np.concatenate([batch.scores for batch in batches]) if batches else None,
+            [links for batch in batches for links in batch.other_links],
+        )
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def record(self, i):
+        score = self.scores[i]
+        return JobRecord(
+            self.titles[i], self.companies[self.company_codes[i]], self.locations[self.location_codes[i]],
+            self.links[i], self.descriptions[i], None if np.isnan(score) else round(float(score), 4),
+            self.other_links[i]
+        )
+
+    def set_scores(self, scores):
+        self.scores = np.asarray(scores, dtype=np.float32)
+        return self
+
+    def take(self, indices):
+        """
+        New batch with the given rows, in that order.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        return JobBatch(
+            [self.titles[i] for i in indices],
+            self.companies, self.company_codes[indices],
+            self.locations, self.location_codes[indices],
+            [self.links[i] for i in indices],
+            [self.descriptions[i] for i in indices],
+            self.scores[indices],
+            [self.other_links[i] for i in indices],
+        )
+
+    def ranked(self, top_k=None):
+        """
+        Rows sorted by score, highest first (unscored rows last).
+        """
+        order = np.argsort(-self.scores, kind="stable")
+        if top_k:
+            order = order[:int(top_k)]
+        return self.take(order)
+
+    def drop_duplicates(self, deduplicator=None):
+        """
+        Keep the first row of each posting: rows with the same job ID or URL,
+        a near-identical description, or (on Indeed) the same (title,
+        company, location) are merged into it, their links added to its
+        other_links.
+        Args:
+            deduplicator (JobDeduplicator, optional): Shared across the batches
+                of one search, so rows repeating an earlier batch are dropped too.
+        """
+        if deduplicator is None:
+            deduplicator = JobDeduplicator()
+        return deduplicator.add_batch(self)
+
+    def _score_column(self):
+        return [None if np.isnan(score) else round(score, 4) for score in self.scores.astype(float).tolist()]
+
+    def to_columns(self):
+        """
+        Dict of column name -> list of values, e.g. for pandas.DataFrame or JSON.
+        """
+        return {
+            "Title": list(self.titles),
+            "Company": [self.companies[code] for code in self.company_codes.tolist()],
+            "Location": [self.locations[code] for code in self.location_codes.tolist()],
+            "Link": list(self.links),
+            "Description": list(self.descriptions),
+            SCORE_FIELD: self._score_column(),
+            OTHER_LINKS_FIELD: [list(links) for links in self.other_links],
+        }
+
+    def to_dicts(self):
+        """
+        List of job dicts shaped like JobRecord.to_dict: "Other Links" appears
+        only on jobs that have some, whatever the rest of the batch holds.
+        """
+        columns = self.to_columns()
+        names = list(columns)
+        if all(score is None for score in columns[SCORE_FIELD]):
+            names.remove(SCORE_FIELD)
+        jobs = [dict(zip(names, row)) for row in zip(*(columns[name] for name in names))]
+        for job in jobs:
+            if not job[OTHER_LINKS_FIELD]:
+                del job[OTHER_LINKS_FIELD]
+        return jobs
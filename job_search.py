@@ -1,38 +1,129 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
 import time
-from time import sleep
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from random import randint
-import math 
 import logging
-logging.disable(logging.CRITICAL)
 import json
-import math
-import http.client
-import json
-import logging
-from selenium.webdriver.common.keys import Keys
-import pandas as pd
-import PyPDF2
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.corpus import stopwords
-import re
 import os
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlparse
 from dotenv import load_dotenv
+from storage import DATA_DIR
+from job_api_client import JobSearchClient
+from cache import TTLCache, SqliteCache, TieredCache, SingleFlight, make_key
+from description_store import get_description_store, normalize_job_url
+from job_dedup import JobDeduplicator, deduplicate_jobs
 
 # Load the environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Keep selenium and webdriver-manager chatter out of the application logs
+for noisy_logger in ("WDM", "selenium", "urllib3"):
+    logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+
+# Where the resolved ChromeDriver path is pinned between runs, and how long to trust it
+CHROMEDRIVER_MANIFEST = os.getenv("CHROMEDRIVER_MANIFEST", os.path.join(DATA_DIR, "chromedriver.json"))
+CHROMEDRIVER_MANIFEST_MAX_AGE = float(os.getenv("CHROMEDRIVER_MANIFEST_MAX_AGE", str(7 * 24 * 3600)))
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+# Cumulative WebDriver startup timings for this process
+_webdriver_startup_stats = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "last_seconds": 0.0}
+_webdriver_startup_lock = threading.Lock()
+
+def _is_valid_chromedriver(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+def _read_chromedriver_manifest():
+    try:
+        with open(CHROMEDRIVER_MANIFEST, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else None
+    except (OSError, ValueError):
+        return None
+
+def _write_chromedriver_manifest(driver_path):
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_MANIFEST), exist_ok=True)
+        tmp_path = f"{CHROMEDRIVER_MANIFEST}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"path": driver_path, "resolved_at": time.time()}, f)
+        os.replace(tmp_path, CHROMEDRIVER_MANIFEST)
+    except OSError as e:
+        logger.warning(f"Could not write ChromeDriver manifest: {e}")
+
+def _resolve_chromedriver_path():
+    # An explicitly configured binary always wins
+    configured_path = os.getenv("CHROMEDRIVER_PATH")
+    if _is_valid_chromedriver(configured_path):
+        return configured_path
+
+    manifest = _read_chromedriver_manifest() or {}
+    pinned_path = manifest.get("path")
+    pinned_age = time.time() - float(manifest.get("resolved_at", 0))
+    if _is_valid_chromedriver(pinned_path) and pinned_age < CHROMEDRIVER_MANIFEST_MAX_AGE:
+        return pinned_path
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+    except Exception as e:
+        # Offline or rate-limited: a stale but existing binary beats no browser at all
+        if _is_valid_chromedriver(pinned_path):
+            logger.warning(f"ChromeDriverManager failed ({e}), using pinned driver {pinned_path}")
+            return pinned_path
+        raise
+
+    _write_chromedriver_manifest(driver_path)
+    return driver_path
+
+def resolve_chromedriver_path():
+    """
+    Resolve the ChromeDriver binary once per process.
+
+    The path is pinned in an on-disk manifest, so later processes skip
+    ChromeDriverManager entirely while the pinned binary still exists and the
+    manifest is younger than CHROMEDRIVER_MANIFEST_MAX_AGE seconds.
+    Returns:
+        str: Path to an executable ChromeDriver.
+    """
+    global _chromedriver_path
+    if _is_valid_chromedriver(_chromedriver_path):
+        return _chromedriver_path
+
+    with _chromedriver_lock:
+        if not _is_valid_chromedriver(_chromedriver_path):
+            start = time.perf_counter()
+            _chromedriver_path = _resolve_chromedriver_path()
+            logger.info(f"Resolved ChromeDriver at {_chromedriver_path} in {time.perf_counter() - start:.3f}s")
+    return _chromedriver_path
+
+def _record_webdriver_startup(seconds):
+    with _webdriver_startup_lock:
+        _webdriver_startup_stats["count"] += 1
+        _webdriver_startup_stats["total_seconds"] += seconds
+        _webdriver_startup_stats["max_seconds"] = max(_webdriver_startup_stats["max_seconds"], seconds)
+        _webdriver_startup_stats["last_seconds"] = seconds
+        count = _webdriver_startup_stats["count"]
+        average = _webdriver_startup_stats["total_seconds"] / count
+    logger.info(f"WebDriver startup took {seconds:.2f}s (count={count}, avg={average:.2f}s)")
+
+def get_webdriver_startup_stats():
+    """
+    Return a snapshot of WebDriver startup timings recorded in this process.
+    """
+    with _webdriver_startup_lock:
+        return dict(_webdriver_startup_stats)
+
 def get_webdriver():
+    # Selenium is imported on first use so the API server starts without it
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
     try:
         print("Debug - Initializing Chrome WebDriver...")
         options = Options()
@@ -46,9 +137,10 @@ def get_webdriver():
         options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
                            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
         
-        # Initialize ChromeDriverManager with specific version and OS
-        manager = ChromeDriverManager()
-        driver_path = manager.install()
+        start = time.perf_counter()
+
+        # Resolved once per process and pinned on disk, see resolve_chromedriver_path
+        driver_path = resolve_chromedriver_path()
         # print(f"Debug - ChromeDriver path: {driver_path}")
         
         # Initialize the service
@@ -57,37 +149,202 @@ def get_webdriver():
         # Create and return the driver
         driver = webdriver.Chrome(service=service, options=options)
         # print("Debug - Chrome WebDriver initialized successfully")
+        _record_webdriver_startup(time.perf_counter() - start)
         return driver
         
     except Exception as e:
         print(f"Debug - Error initializing Chrome WebDriver: {str(e)}")
         raise
 
-# Not being used
-def scrape_indeed_jobs(job_title, location, page = 1):
+
+class WebDriverPool:
+    """
+    Bounded pool of reusable Chrome WebDriver instances.
+
+    Drivers are leased and returned instead of being started and quit for every
+    page. At most max_size browsers exist at once; callers wait for a free one.
+    Idle drivers are health-checked before being handed out, and a driver is
+    recycled once it has loaded max_pages pages, which keeps Chrome's memory
+    growth in check. shutdown() quits every browser the pool owns.
+    """
+
+    def __init__(self, max_size=2, max_pages=50, lease_timeout=300):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.lease_timeout = lease_timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._page_counts = {}
+        self._closed = False
+
+    def acquire(self, timeout=None):
+        """
+        Lease a driver, starting a new browser only when no healthy idle one exists.
+        Args:
+            timeout (float, optional): Seconds to wait for a free slot.
+        Returns:
+            WebDriver: A driver that must be given back with release().
+        """
+        if self._closed:
+            raise RuntimeError("WebDriver pool has been shut down")
+        timeout = self.lease_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No WebDriver became available within {timeout:.1f}s")
+
+        try:
+            while True:
+                with self._lock:
+                    driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    driver = get_webdriver()
+                    with self._lock:
+                        self._page_counts[id(driver)] = 0
+                    return driver
+                if self._is_healthy(driver):
+                    return driver
+                self._quit(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, discard=False):
+        """
+        Return a leased driver to the pool.
+        Args:
+            driver (WebDriver): Driver obtained from acquire().
+            discard (bool): Quit the driver instead of keeping it for reuse.
+        """
+        try:
+            with self._lock:
+                worn_out = self._page_counts.get(id(driver), 0) >= self.max_pages
+            if discard or worn_out or self._closed:
+                self._quit(driver)
+                return
+            try:
+                # Drop the previous page so an idle browser holds as little memory as possible
+                driver.get("about:blank")
+            except Exception:
+                self._quit(driver)
+                return
+            with self._lock:
+                self._idle.append(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Context manager around acquire() and release().
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def open_page(self, driver, url):
+        """
+        Load a URL in a leased driver and count it towards the driver's recycle limit.
+        """
+        with self._lock:
+            self._page_counts[id(driver)] = self._page_counts.get(id(driver), 0) + 1
+        driver.get(url)
+
+    def shutdown(self):
+        """
+        Quit all idle drivers; drivers still leased are quit when they are released.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+    def _is_healthy(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, driver):
+        with self._lock:
+            self._page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Debug - Error closing driver: {e}")
+
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """
+    Return the process-wide WebDriver pool, creating it on first use.
+    Its size and recycle limit come from WEBDRIVER_POOL_SIZE and WEBDRIVER_MAX_PAGES.
+    """
+    global _driver_pool
+    if _driver_pool is None:
+        with _driver_pool_lock:
+            if _driver_pool is None:
+                _driver_pool = WebDriverPool(
+                    max_size=int(os.getenv("WEBDRIVER_POOL_SIZE", "4")),
+                    max_pages=int(os.getenv("WEBDRIVER_MAX_PAGES", "50")),
+                    lease_timeout=float(os.getenv("WEBDRIVER_LEASE_TIMEOUT", "300")),
+                )
+                # Make sure no Chrome process outlives the interpreter
+                atexit.register(_driver_pool.shutdown)
+    return _driver_pool
+
+def shutdown_driver_pool():
+    """
+    Quit every pooled browser, if the pool was ever created.
+    """
+    if _driver_pool is not None:
+        _driver_pool.shutdown()
+
+def scrape_indeed_jobs(job_title, location, page = 1, first_page = 1, deadline=None):
+    from bs4 import BeautifulSoup
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     jobs_per_page = 10  # Number of jobs per page
     base_url = "https://www.indeed.com/jobs"
     url_template = f"?q={job_title.replace(' ', '+')}&l={location.replace(' ', '+')}&sort=date"
 
     job_list = []  # List to store all job details
-    seen_jobs = set()  # To track unique jobs based on (Title, Company, Location)
+    deduplicator = JobDeduplicator()  # To track unique jobs by job ID and (Title, Company, Location)
     num_jobs = page * 15
-    
-    for i in range(page):
-        start = i * jobs_per_page
-        url = base_url + url_template + f"&start={start}"
-        driver = get_webdriver()
-        driver.get(url)
-        time.sleep(2)
 
-        while True:
+    driver_pool = get_driver_pool()
+    # Waiting for a browser counts against the deadline too
+    lease_timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+    # One leased browser serves the listing pages and every job link
+    with ExitStack() as stack:
+        try:
+            driver = stack.enter_context(driver_pool.lease(lease_timeout))
+        except TimeoutError as e:
+            logger.warning(f"Skipping Indeed page {first_page}: {e}")
+            return []
+        for i in range(first_page - 1, first_page - 1 + page):
+            # Past the deadline, stop loading results pages
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            start = i * jobs_per_page
+            url = base_url + url_template + f"&start={start}"
+            driver_pool.open_page(driver, url)
+            time.sleep(2)
+
             try:
                 # Wait for the job listings to load
                 WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.CLASS_NAME, "job_seen_beacon")))
             except Exception as e:
                 break
 
-            # Parse the current page
+            # Parse the current page before navigating away to the job links
             html_content = driver.page_source
             soup = BeautifulSoup(html_content, "html.parser")
 
@@ -107,96 +364,334 @@ def scrape_indeed_jobs(job_title, location, page = 1):
 
                     location_element = job.find("div", attrs={"data-testid": "text-location"})
                     job_location = location_element.text.strip() if location_element else "N/A"
-                    
-                    # Create a unique identifier for the job
-                    job_id = (title, company, job_location)
-                    
-                    if job_id in seen_jobs:
-                        continue  # Skip this job if it's a duplicate
-
-                    # Add to the set of seen jobs
-                    seen_jobs.add(job_id)
 
                     # Extract job link
                     link_element = job.find("a", href=True)
                     job_link = "https://www.indeed.com" + link_element["href"] if link_element else "N/A"
 
-                    # Visit the job link to fetch the description
-                    description = "N/A"
-                    if job_link != "N/A":
-                        driver = get_webdriver()
-                        driver.get(job_link)
-                        time.sleep(2)  # Allow the job description to load
-                        job_page_html = driver.page_source
-                        job_soup = BeautifulSoup(job_page_html, "html.parser")
-                        WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.ID, "jobDescriptionText")))
-                        description_element = driver.find_element(By.ID, "jobDescriptionText")
-                        description = description_element.text.strip() if description_element else "N/A"
-
-                    # Append job details to the list
-                    job_list.append({
+                    job_details = {
                         "Title": title,
                         "Company": company,
                         "Location": job_location,
                         "Link": job_link,
-                        "Description": description,
-                    })
+                        "Description": "N/A",
+                    }
+
+                    # Skip reposts of a job already on the list (same job ID, or same title,
+                    # company and location) before fetching its description
+                    if not deduplicator.add_jobs([job_details]):
+                        continue
+
+                    # Visit the job link to fetch the description, while there is time left
+                    remaining = 30 if deadline is None else min(30, deadline - time.monotonic())
+                    if job_link != "N/A" and remaining > 0:
+                        driver_pool.open_page(driver, job_link)
+                        WebDriverWait(driver, remaining).until(EC.presence_of_element_located((By.ID, "jobDescriptionText")))
+                        description_element = driver.find_element(By.ID, "jobDescriptionText")
+                        job_details["Description"] = description_element.text.strip() if description_element else "N/A"
+
+                    # Append job details to the list
+                    job_list.append(job_details)
 
                 except Exception as e:
                     print(f"Error extracting job: {e}")
-                    
+
                 # Stop if we've collected the required number of jobs
                 if len(job_list) >= num_jobs:
                     break
 
+            if len(job_list) >= num_jobs:
+                break
 
-    driver.quit()
     return job_list
 
+def scrape_indeed_page(job_title, location, page = 1, deadline=None):
+    """
+    Scrape a single Indeed results page (1-based), for callers that fetch pages in parallel.
+
+    Once the deadline (a time.monotonic() value) passes, the remaining
+    postings keep "N/A" as their description instead of being visited, and
+    no jobs are returned if no browser became free before it.
+    """
+    return scrape_indeed_jobs(job_title, location, page=1, first_page=page, deadline=deadline)
+
+
+
+_job_search_client = None
+_job_search_client_lock = threading.Lock()
+
+def get_job_search_client():
+    """
+    Return the process-wide RapidAPI job search client, creating it on first use.
+    Its connection pool and retry policy come from JOB_SEARCH_MAX_CONNECTIONS,
+    JOB_SEARCH_TIMEOUT and JOB_SEARCH_MAX_RETRIES.
+    """
+    global _job_search_client
+    if _job_search_client is None:
+        with _job_search_client_lock:
+            if _job_search_client is None:
+                _job_search_client = JobSearchClient(
+                    os.getenv("JOB_SEARCH_X_RAPIDAPI_HOST"),
+                    api_key=os.getenv("RAPID_API_KEY"),
+                    max_connections=int(os.getenv("JOB_SEARCH_MAX_CONNECTIONS", "4")),
+                    timeout=float(os.getenv("JOB_SEARCH_TIMEOUT", "15")),
+                    max_retries=int(os.getenv("JOB_SEARCH_MAX_RETRIES", "3")),
+                )
+                atexit.register(_job_search_client.close)
+    return _job_search_client
+
+# Description used when a posting's text could not be fetched
+DESCRIPTION_PLACEHOLDER = "No description available"
+
+# Containers LinkedIn has used for the job description, most specific first
+LINKEDIN_DESCRIPTION_XPATHS = [
+    "//div[contains(@class, 'show-more-less-html__markup')]",
+    "//div[contains(@class, 'jobs-description__content')]",
+    "//div[contains(@class, 'description__text')]",
+    "//div[contains(@class, 'jobs-box__html-content')]"
+]
+
+def fetch_linkedin_description(url, lease_timeout=None):
+    """
+    Load a LinkedIn posting in a pooled browser and return its description text.
+    Args:
+        url (str): Job posting URL.
+        lease_timeout (float, optional): Seconds to wait for a free browser.
+    Returns:
+        str or None: The description, or None if none could be found.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver_pool = get_driver_pool()
+    driver = driver_pool.acquire(lease_timeout)
+    discard = False
+    try:
+        # Set page load timeout
+        driver.set_page_load_timeout(20)
+
+        # Try to load the page
+        try:
+            driver_pool.open_page(driver, url)
+        except Exception as e:
+            logger.warning(f"Page load timeout for {url}: {e}")
+            # A browser stuck mid-load is not worth reusing
+            discard = True
+            return None
+
+        # Wait once for any of the description containers instead of up to 10s per selector
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.XPATH, " | ".join(LINKEDIN_DESCRIPTION_XPATHS)))
+            )
+        except Exception:
+            return None
+
+        for xpath in LINKEDIN_DESCRIPTION_XPATHS:
+            try:
+                for element in driver.find_elements(By.XPATH, xpath):
+                    # Scroll element into view
+                    driver.execute_script("arguments[0].scrollIntoView(true);", element)
+
+                    # Try different methods to get text
+                    text = element.text.strip()
+                    if not text:
+                        text = driver.execute_script("return arguments[0].textContent;", element).strip()
+
+                    if text and len(text) > 50:
+                        return text
+            except Exception as e:
+                # print(f"Debug - Selector {xpath} failed: {e}")
+                continue
+        return None
+    finally:
+        driver_pool.release(driver, discard=discard)
+
+# Description fetches in progress by normalized URL, shared by the pages of concurrent searches
+_inflight_descriptions = SingleFlight()
+
+# One semaphore per host for the whole process, so the per-host cap holds across
+# the parallel pages of a search and across concurrent searches
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+
+def _host_semaphore(host, limit):
+    # The limit in force when a host is first seen applies from then on
+    with _host_limits_lock:
+        semaphore = _host_limits.get(host)
+        if semaphore is None:
+            semaphore = _host_limits[host] = threading.BoundedSemaphore(limit)
+        return semaphore
 
+def fetch_descriptions(jobs, fetcher=fetch_linkedin_description, max_workers=None, per_host_limit=None, deadline=None, use_store=True):
+    """
+    Fill in missing job descriptions concurrently.
 
-def scrape_linkedin_jobs(search_term, location, page = 1):
+    Postings without a description are fetched on a thread pool, with at most
+    per_host_limit fetches running against any one host across every call in
+    the process. Whatever is still
+    missing when the deadline passes gets the placeholder description, so the
+    wall-clock time of this stage is bounded by the slowest fetch or the
+    deadline, whichever comes first.
+    Args:
+        jobs (list[dict]): Job dictionaries; updated in place.
+        fetcher (callable): Takes a URL and a lease timeout, returns text or None.
+        max_workers (int, optional): Thread pool size (DESCRIPTION_FETCH_WORKERS).
+        per_host_limit (int, optional): Concurrent fetches per host (DESCRIPTION_FETCH_PER_HOST).
+        deadline (float, optional): time.monotonic() value by which to stop waiting.
+            Defaults to DESCRIPTION_FETCH_TIMEOUT seconds from now.
+        use_store (bool): Serve and save descriptions through the description store,
+            so a posting is only fetched on a miss or once its entry has expired.
+    Returns:
+        list[dict]: The same job list.
+    """
+    pending = [job for job in jobs if not job.get("Description") and job.get("Link", "N/A") != "N/A"]
+    if not pending:
+        return jobs
+
+    # Postings seen before are served from the description store; only misses hit a browser
+    store = get_description_store() if use_store else None
+    if store is not None:
+        try:
+            stored = store.get_many([job["Link"] for job in pending])
+        except Exception as e:
+            logger.warning(f"Description store lookup failed: {e}")
+            stored = {}
+        for job in pending:
+            description = stored.get(normalize_job_url(job["Link"]))
+            if description:
+                job["Description"] = description
+        pending = [job for job in pending if not job["Description"]]
+        if not pending:
+            return jobs
+
+    if max_workers is None:
+        max_workers = int(os.getenv("DESCRIPTION_FETCH_WORKERS", "4"))
+    if per_host_limit is None:
+        per_host_limit = int(os.getenv("DESCRIPTION_FETCH_PER_HOST", "4"))
+    if deadline is None:
+        deadline = time.monotonic() + float(os.getenv("DESCRIPTION_FETCH_TIMEOUT", "120"))
+
+    def fetch(url):
+        # A posting another page or search is already fetching is waited for, not loaded again
+        description, _ = _inflight_descriptions.do(normalize_job_url(url) or url, lambda: fetch_limited(url))
+        return description
+
+    def fetch_limited(url):
+        host_limit = _host_semaphore(urlparse(url).netloc.lower(), per_host_limit)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not host_limit.acquire(timeout=remaining):
+            return None
+        try:
+            return fetcher(url, max(deadline - time.monotonic(), 0.001))
+        finally:
+            host_limit.release()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))))
+    try:
+        futures = {executor.submit(fetch, job["Link"]): job for job in pending}
+        done, not_done = wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            logger.warning(f"Description deadline hit, {len(not_done)} postings left without a description")
+
+        fetched = []
+        for future, job in futures.items():
+            description = None
+            if future in done:
+                try:
+                    description = future.result()
+                except Exception as e:
+                    logger.warning(f"Error fetching description: {e}")
+            if description:
+                fetched.append((job["Link"], description))
+            job["Description"] = description or DESCRIPTION_PLACEHOLDER
+
+        # Placeholders are not stored, so those postings are tried again next time
+        if store is not None and fetched:
+            try:
+                store.put_many(fetched)
+            except Exception as e:
+                logger.warning(f"Description store update failed: {e}")
+    finally:
+        # Fetches still running past the deadline finish in the background and are ignored
+        executor.shutdown(wait=False)
+
+    return jobs
+
+_job_search_cache = None
+_job_search_cache_lock = threading.Lock()
+
+def get_job_search_cache():
+    """
+    Return the process-wide cache of enriched LinkedIn search results.
+
+    The in-memory tier holds JOB_CACHE_SIZE entries for JOB_CACHE_TTL seconds.
+    Setting JOB_CACHE_DB to a file path adds a SQLite tier that survives restarts.
+    """
+    global _job_search_cache
+    if _job_search_cache is None:
+        with _job_search_cache_lock:
+            if _job_search_cache is None:
+                ttl = float(os.getenv("JOB_CACHE_TTL", "3600"))
+                memory = TTLCache(maxsize=int(os.getenv("JOB_CACHE_SIZE", "256")), ttl=ttl)
+                disk = None
+                if os.getenv("JOB_CACHE_DB"):
+                    disk = SqliteCache(
+                        os.getenv("JOB_CACHE_DB"), ttl=ttl,
+                        max_entries=int(os.getenv("JOB_CACHE_DISK_SIZE", "10000"))
+                    )
+                _job_search_cache = TieredCache(memory, disk)
+    return _job_search_cache
+
+def scrape_linkedin_jobs(search_term, location, page = 1, fetch_missing_descriptions=True, deadline=None):
+    """
+    Search LinkedIn jobs through RapidAPI, with descriptions filled in.
+
+    Fully enriched results are cached per (search term, location, page), so a
+    repeated search within the TTL skips both the API call and the browser
+    fallback. Results where some descriptions could not be fetched are kept
+    for JOB_CACHE_PARTIAL_TTL seconds only, so they are retried sooner.
+    """
+    if not fetch_missing_descriptions:
+        return _scrape_linkedin_jobs(search_term, location, page, fetch_missing_descriptions, deadline)
+
+    cache = get_job_search_cache()
+    cache_key = make_key("linkedin", search_term, location, page)
+    cached_jobs = cache.get(cache_key)
+    if cached_jobs is not None:
+        logger.info(f"Cache hit for LinkedIn search ({len(cached_jobs)} jobs)")
+        # Callers annotate jobs in place, so never hand out the cached dicts
+        return [dict(job) for job in cached_jobs]
+
+    jobs_list = _scrape_linkedin_jobs(search_term, location, page, fetch_missing_descriptions, deadline)
+    if jobs_list:
+        partial = any(job["Description"] == DESCRIPTION_PLACEHOLDER for job in jobs_list)
+        ttl = float(os.getenv("JOB_CACHE_PARTIAL_TTL", "300")) if partial else None
+        cache.set(cache_key, [dict(job) for job in jobs_list], ttl)
+    return jobs_list
+
+def _scrape_linkedin_jobs(search_term, location, page = 1, fetch_missing_descriptions=True, deadline=None):
     print("\n=== Starting LinkedIn Job Search ===")
-    # Access variables
-    RAPID_API_KEY = os.getenv("RAPID_API_KEY")
-    JOB_SEARCH_URL = os.getenv("JOB_SEARCH_URL")
-    JOB_SEARCH_X_RAPIDAPI_HOST = os.getenv("JOB_SEARCH_X_RAPIDAPI_HOST")
     
     # Initialize jobs list
     jobs_list = []
     
     try:
-        # Establish connection to RapidAPI
+        # Reuse pooled keep-alive connections to RapidAPI
         #print("Debug - Connecting to LinkedIn API...")
-        conn = http.client.HTTPSConnection(JOB_SEARCH_X_RAPIDAPI_HOST)
-
-        # API request payload
-        payload = json.dumps({
-            "search_terms": search_term,
-            "location": location,
-            "page": page
-        })
-
-        # Request headers
-        headers = {
-            "x-rapidapi-key": RAPID_API_KEY,
-            "x-rapidapi-host": JOB_SEARCH_X_RAPIDAPI_HOST,
-            "Content-Type": "application/json"
-        }
+        client = get_job_search_client()
 
         # Send POST request
         # print("Debug - Sending request to LinkedIn API...")
-        conn.request("POST", "/", payload, headers)
-        res = conn.getresponse()
-        # print(f"Debug - API Response Status: {res.status}")
+        status, json_response = client.search(search_term, location, page)
+        # print(f"Debug - API Response Status: {status}")
         
-        if res.status != 200:
-            # print(f"Debug - API Error: Status {res.status}")
+        if status != 200:
+            # print(f"Debug - API Error: Status {status}")
             return []
-            
-        data = res.read()
-        decoded_data = data.decode("utf-8")
-        json_response = json.loads(decoded_data)
         
         if not isinstance(json_response, list):
             print(f"Debug - Unexpected API response format: {type(json_response)}")
@@ -215,72 +710,6 @@ def scrape_linkedin_jobs(search_term, location, page = 1):
                     "Link": job.get("linkedin_job_url_cleaned", "N/A"),
                     "Description": job.get("job_description", "")
                 }
-                
-                # If we don't have a description from the API, try to get it from the job URL
-                if not job_details["Description"] and job_details["Link"] != "N/A":
-                    driver = None
-                    try:
-                        #print(f"Debug - Fetching description from: {job_details['Link']}")
-                        driver = get_webdriver()
-                        
-                        # Set page load timeout
-                        driver.set_page_load_timeout(20)
-                        
-                        # Try to load the page
-                        try:
-                            driver.get(job_details["Link"])
-                        except Exception as e:
-                            print(f"Debug - Page load timeout: {e}")
-                            driver.quit()
-                            driver = None
-                            raise
-                        
-                        # Wait for any one of the description containers to be present
-                        description_selectors = [
-                            "//div[contains(@class, 'show-more-less-html__markup')]",
-                            "//div[contains(@class, 'jobs-description__content')]",
-                            "//div[contains(@class, 'description__text')]",
-                            "//div[contains(@class, 'jobs-box__html-content')]"
-                        ]
-                        
-                        # Wait for any of the selectors to be present
-                        for xpath in description_selectors:
-                            try:
-                                element = WebDriverWait(driver, 10).until(
-                                    EC.presence_of_element_located((By.XPATH, xpath))
-                                )
-                                if element:
-                                    # Scroll element into view
-                                    driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                                    time.sleep(1)
-                                    
-                                    # Try different methods to get text
-                                    text = element.text.strip()
-                                    if not text:
-                                        text = driver.execute_script("return arguments[0].textContent;", element).strip()
-                                    
-                                    if text and len(text) > 50:
-                                        # print(f"Debug - Found description using {xpath} ({len(text)} chars)")
-                                        job_details["Description"] = text
-                                        break
-                            except Exception as e:
-                                # print(f"Debug - Selector {xpath} failed: {e}")
-                                continue
-                        
-                        if job_details["Description"] == "":
-                           # print("Debug - No description found with any selector")
-                            job_details["Description"] = "No description available"
-                            
-                    except Exception as e:
-                       # print(f"Debug - Error fetching description: {e}")
-                        job_details["Description"] = "No description available"
-                    finally:
-                        if driver:
-                            try:
-                                driver.quit()
-                            except Exception as e:
-                                print(f"Debug - Error closing driver: {e}")
-                
                 jobs_list.append(job_details)
                 #print(f"Debug - Processed job: {job_details['Title']} at {job_details['Company']}")
                 
@@ -290,6 +719,24 @@ def scrape_linkedin_jobs(search_term, location, page = 1):
     
     except Exception as e:
         print(f"Debug - LinkedIn API Error: {e}")
+
+    # Reposts and postings listed twice are collapsed before any description is stored or fetched
+    jobs_list = deduplicate_jobs(jobs_list)
+
+    # Keep descriptions the API did return, so later searches can reuse them by URL
+    api_descriptions = [(job["Link"], job["Description"]) for job in jobs_list if job["Description"]]
+    if api_descriptions:
+        try:
+            get_description_store().put_many(api_descriptions)
+        except Exception as e:
+            logger.warning(f"Description store update failed: {e}")
+
+    # Postings the API returned without a description are fetched in their own concurrent stage
+    if fetch_missing_descriptions:
+        try:
+            fetch_descriptions(jobs_list, deadline=deadline)
+        except Exception as e:
+            logger.error(f"Error fetching descriptions: {e}")
     
     print(f"Debug - Total jobs collected: {len(jobs_list)}")
-    return jobs_list
\ No newline at end of file
+    return jobs_list
@@ -0,0 +1,524 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from job_dedup import posting_key
+from job_records import JOB_FIELDS
+from storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding every posting collected so far
+JOB_STORE_DB = os.getenv("JOB_STORE_DB", os.path.join(DATA_DIR, "jobs.db"))
+
+# Where indexes are saved between runs
+JOB_INDEX_DIR = os.getenv("JOB_INDEX_DIR", os.path.join(DATA_DIR, "job_index"))
+
+# Rows scored per block in brute-force search, and the index size from which HNSW is used
+INDEX_BLOCK_SIZE = int(os.getenv("JOB_INDEX_BLOCK_SIZE", "8192"))
+HNSW_MIN_SIZE = int(os.getenv("JOB_INDEX_HNSW_MIN_SIZE", "20000"))
+
+
+def _import_hnswlib():
+    # Optional: approximate search for large Doc2Vec indexes, imported when first needed
+    try:
+        import hnswlib
+    except ImportError:
+        return None
+    return hnswlib
+
+
+def job_key(job):
+    """
+    Identity of a posting in the store: its job ID or normalized URL (see
+    job_dedup.posting_key), or a hash of title, company and location when it
+    has no link.
+    """
+    url_key = posting_key(job.get("Link"))
+    if url_key:
+        return url_key
+    identity = "|".join(" ".join(str(job.get(field, "")).lower().split()) for field in ("Title", "Company", "Location"))
+    return "sha256:" + hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def _escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class JobStore:
+    """
+    Local SQLite store of job postings, filled by the scrapers and searched
+    through JobIndex. Row IDs only ever grow, which lets indexes pick up new
+    postings incrementally.
+    """
+
+    def __init__(self, path=JOB_STORE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, job_key TEXT UNIQUE NOT NULL, "
+                "title TEXT, company TEXT, location TEXT, link TEXT, description TEXT NOT NULL, "
+                "added_at REAL NOT NULL)"
+            )
+
+    def add_jobs(self, jobs):
+        """
+        Add postings with a description; postings already stored are skipped.
+        Returns:
+            int: Number of postings added.
+        """
+        now = time.time()
+        rows = [
+            (job_key(job), job.get("Title"), job.get("Company"), job.get("Location"),
+             job.get("Link"), job["Description"], now)
+            for job in jobs if job.get("Description")
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO jobs (job_key, title, company, location, link, description, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return self._connection.total_changes - before
+
+    def iter_descriptions_after(self, last_id, batch_size=5000):
+        """
+        Yield (id, description) for postings added after last_id, in ID order.
+        """
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT id, description FROM jobs WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][0]
+
+    def get_jobs_by_id(self, ids):
+        """
+        Return a dict of job ID -> job dict for the IDs that exist.
+        """
+        ids = [int(job_id) for job_id in ids]
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT id, title, company, location, link, description FROM jobs "
+                    f"WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = dict(zip(JOB_FIELDS, row[1:]))
+        return found
+
+    def ids_matching(self, job_title="", location=""):
+        """
+        IDs of the postings whose title contains every word of job_title and
+        whose location contains location, ignoring case. Empty criteria match
+        everything.
+        """
+        clauses, params = [], []
+        for word in str(job_title or "").lower().split():
+            clauses.append("lower(title) LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(word)}%")
+        location = " ".join(str(location or "").lower().split())
+        if location:
+            clauses.append("lower(location) LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(location)}%")
+        query = "SELECT id FROM jobs" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+
+    def count(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+def top_k_blocked(matrix, query, top_k, block_size=INDEX_BLOCK_SIZE):
+    """
+    Brute-force top-k by inner product, scoring block_size rows at a time so
+    memory stays flat however large the matrix is.
+    Args:
+        matrix: Dense ndarray or sparse CSR matrix, one row per posting.
+        query (numpy.ndarray): Dense query vector.
+    Returns:
+        tuple: (row indices, scores), best first.
+    """
+    best_rows = np.zeros(0, dtype=np.int64)
+    best_scores = np.zeros(0, dtype=np.float32)
+    for start in range(0, matrix.shape[0], block_size):
+        block_scores = np.asarray(matrix[start:start + block_size] @ query).ravel().astype(np.float32)
+        if len(block_scores) > top_k:
+            keep = np.argpartition(-block_scores, top_k - 1)[:top_k]
+        else:
+            keep = np.arange(len(block_scores))
+        best_rows = np.concatenate([best_rows, keep + start])
+        best_scores = np.concatenate([best_scores, block_scores[keep]])
+        if len(best_scores) > top_k:
+            keep = np.argpartition(-best_scores, top_k - 1)[:top_k]
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+    order = np.argsort(-best_scores, kind="stable")
+    return best_rows[order], best_scores[order]
+
+
+class JobIndex:
+    """
+    Vector index over the postings in a JobStore.
+
+    "tfidf" indexes sparse rows from the corpus-level IDF model. "doc2vec"
+    indexes dense Doc2Vec vectors, and additionally keeps an HNSW graph once
+    the index holds HNSW_MIN_SIZE postings if hnswlib is installed. Exact
+    search is a blocked matrix product over all rows.
+
+    refresh() appends postings stored since the last call, embedding them
+    outside the lock searches take and swapping the result in at the end, and
+    saves the index under path so a restarted process (or a new server
+    worker) loads it instead of embedding the whole store again. The HNSW
+    graph is extended in place. The index is rebuilt from scratch when the
+    model it was built with has been replaced (a new Doc2Vec model, or an IDF
+    model started over), and the TF-IDF index also once the IDF model has
+    grown by 10% since the last full build, so old rows do not drift too far
+    from current weights; searches keep using the old index until the
+    rebuild is done. refresh_async() runs refresh on a background
+    thread, for the request path.
+    """
+
+    def __init__(self, store, mode="tfidf", path=None):
+        if mode not in ("tfidf", "doc2vec"):
+            raise ValueError(f"Unknown index mode: {mode}")
+        self.store = store
+        self.mode = mode
+        self.path = path
+        # _lock guards the published state, _refresh_lock lets one refresh run at a time
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._hnsw_lock = threading.Lock()
+        self._refresh_thread = None
+        self._loaded = False
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._matrix = None
+        self._last_id = 0
+        self._built_with_documents = 0
+        self._stamp = ""
+        self._hnsw = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _embed(self, texts):
+        if self.mode == "tfidf":
+            from idf_model import get_idf_model
+            return get_idf_model().transform(texts)
+
+        from doc2vec_model import get_doc2vec_model, infer_vectors
+        from text_processing import get_token_streams
+        model = get_doc2vec_model()
+        if model is None:
+            raise RuntimeError("No pre-trained Doc2Vec model found, run `python doc2vec_model.py` first")
+        return infer_vectors(model, [stream.tokens for stream in get_token_streams(texts)])
+
+    def _model_stamp(self):
+        # Identifies the model the rows were embedded with; an index built with
+        # another model is rebuilt rather than reused
+        if self.mode == "tfidf":
+            from idf_model import get_idf_model
+            return get_idf_model().model_id
+        from doc2vec_model import DOC2VEC_MODEL_PATH
+        return str(os.path.getmtime(DOC2VEC_MODEL_PATH)) if os.path.exists(DOC2VEC_MODEL_PATH) else ""
+
+    def _file(self, extension):
+        return os.path.join(self.path, f"{self.mode}.{extension}")
+
+    def load(self):
+        """
+        Load the saved index, if any and not loaded yet.
+        Returns:
+            bool: Whether a saved index was loaded.
+        """
+        # Checked first so searches do not wait on a refresh that is running
+        if self._loaded:
+            return False
+        with self._refresh_lock:
+            return self._load()
+
+    def _load(self):
+        if self._loaded:
+            return False
+        self._loaded = True
+        if self.path is None or not os.path.exists(self._file("npz")):
+            return False
+        try:
+            stamp = self._model_stamp()
+            with np.load(self._file("npz"), allow_pickle=False) as saved:
+                if str(saved["model_stamp"]) != stamp:
+                    logger.info(f"Saved {self.mode} job index was built with another model, ignoring it")
+                    return False
+                ids = saved["ids"]
+                if self.mode == "doc2vec":
+                    matrix = saved["vectors"]
+                else:
+                    matrix = sparse.csr_matrix(
+                        (saved["data"], saved["indices"], saved["indptr"]), shape=tuple(saved["shape"])
+                    )
+                built_with_documents = int(saved["built_with_documents"])
+        except Exception as e:
+            logger.warning(f"Could not load the saved {self.mode} job index, rebuilding it: {str(e)}")
+            return False
+
+        hnsw = self._extend_hnsw(self._load_hnsw(matrix), matrix) if self.mode == "doc2vec" else None
+        with self._lock:
+            self._ids, self._matrix, self._hnsw = ids, matrix, hnsw
+            self._last_id = int(ids[-1]) if len(ids) else 0
+            self._built_with_documents = built_with_documents
+            self._stamp = stamp
+        logger.info(f"Loaded the saved {self.mode} job index ({len(ids)} postings)")
+        return True
+
+    def _load_hnsw(self, matrix):
+        hnswlib = _import_hnswlib()
+        if hnswlib is None or not os.path.exists(self._file("hnsw")):
+            return None
+        try:
+            index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+            index.load_index(self._file("hnsw"), max_elements=matrix.shape[0])
+        except Exception as e:
+            logger.warning(f"Could not load the saved HNSW graph, rebuilding it: {str(e)}")
+            return None
+        # Saved after the matrix, so it can only be behind it; the missing rows are added by the caller
+        if index.get_current_count() > matrix.shape[0]:
+            return None
+        index.set_ef(128)
+        return index
+
+    def _save(self, ids, matrix, built_with_documents, stamp, hnsw):
+        os.makedirs(self.path, exist_ok=True)
+        arrays = {
+            "ids": ids,
+            "built_with_documents": np.asarray(built_with_documents),
+            "model_stamp": np.asarray(stamp),
+        }
+        if self.mode == "doc2vec":
+            arrays["vectors"] = matrix
+        else:
+            arrays.update(data=matrix.data, indices=matrix.indices, indptr=matrix.indptr, shape=np.asarray(matrix.shape))
+        # Written next to the target and renamed over it, so readers see the old or the new file
+        temporary = self._file(f"npz.{os.getpid()}.tmp")
+        with open(temporary, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temporary, self._file("npz"))
+        if hnsw is not None:
+            temporary = self._file(f"hnsw.{os.getpid()}.tmp")
+            with self._hnsw_lock:
+                hnsw.save_index(temporary)
+            os.replace(temporary, self._file("hnsw"))
+
+    def refresh(self):
+        """
+        Index postings added to the store since the last refresh, and save the index.
+        Returns:
+            int: Number of postings added to the index.
+        """
+        with self._refresh_lock:
+            self._load()
+            stamp = self._model_stamp()
+            with self._lock:
+                ids, matrix, last_id, hnsw = self._ids, self._matrix, self._last_id, self._hnsw
+                built_with_documents, built_stamp = self._built_with_documents, self._stamp
+
+            if matrix is not None and stamp != built_stamp:
+                logger.info(f"The {self.mode} model was replaced, rebuilding the job index")
+                ids, matrix, last_id, hnsw = np.zeros(0, dtype=np.int64), None, 0, None
+            if self.mode == "tfidf":
+                from idf_model import get_idf_model
+                num_documents = get_idf_model().num_documents
+                # A model with fewer documents than the index was built with has been reset
+                if matrix is not None and not built_with_documents <= num_documents <= built_with_documents * 1.1:
+                    logger.info("IDF model has drifted, rebuilding the TF-IDF job index")
+                    ids, matrix, last_id = np.zeros(0, dtype=np.int64), None, 0
+                if matrix is None:
+                    built_with_documents = num_documents
+
+            new_ids = []
+            new_rows = []
+            pending_ids, pending_texts = [], []
+            for job_id, description in self.store.iter_descriptions_after(last_id):
+                pending_ids.append(job_id)
+                pending_texts.append(description)
+                if len(pending_texts) >= INDEX_BLOCK_SIZE:
+                    new_rows.append(self._embed(pending_texts))
+                    new_ids.extend(pending_ids)
+                    pending_ids, pending_texts = [], []
+            if pending_texts:
+                new_rows.append(self._embed(pending_texts))
+                new_ids.extend(pending_ids)
+            if not new_ids:
+                return 0
+
+            matrix = self._stack([matrix] + new_rows if matrix is not None else new_rows)
+            ids = np.concatenate([ids, np.asarray(new_ids, dtype=np.int64)])
+            if self.mode == "doc2vec":
+                hnsw = self._extend_hnsw(hnsw, matrix)
+
+            with self._lock:
+                self._ids, self._matrix, self._hnsw = ids, matrix, hnsw
+                self._last_id = int(ids[-1])
+                self._built_with_documents = built_with_documents
+                self._stamp = stamp
+            logger.info(f"Indexed {len(new_ids)} postings ({len(ids)} total, {self.mode})")
+
+            if self.path is not None:
+                try:
+                    self._save(ids, matrix, built_with_documents, stamp, hnsw)
+                except Exception as e:
+                    logger.error(f"Could not save the {self.mode} job index: {str(e)}")
+            return len(new_ids)
+
+    def refresh_async(self):
+        """
+        Start refresh() on a background thread unless one is already running.
+        Returns:
+            bool: Whether a refresh was started.
+        """
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_in_background, name=f"job-index-{self.mode}", daemon=True
+            )
+            self._refresh_thread.start()
+        return True
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing the {self.mode} job index: {str(e)}")
+
+    def _stack(self, parts):
+        if self.mode == "doc2vec":
+            return np.vstack(parts).astype(np.float32)
+        # Older rows were built with a smaller vocabulary; widen them before stacking
+        width = max(part.shape[1] for part in parts)
+        widened = [sparse.csr_matrix((part.data, part.indices, part.indptr), shape=(part.shape[0], width)) for part in parts]
+        return sparse.vstack(widened, format="csr")
+
+    def _extend_hnsw(self, hnsw, matrix):
+        # Adds the rows the graph is missing; a new graph is only built the first time
+        hnswlib = _import_hnswlib()
+        if hnswlib is None or matrix.shape[0] < HNSW_MIN_SIZE:
+            return None
+        if hnsw is None:
+            hnsw = hnswlib.Index(space="ip", dim=matrix.shape[1])
+            hnsw.init_index(max_elements=matrix.shape[0], ef_construction=200, M=16)
+            hnsw.add_items(matrix, np.arange(matrix.shape[0]))
+            hnsw.set_ef(128)
+            return hnsw
+        start = hnsw.get_current_count()
+        if start < matrix.shape[0]:
+            # The graph is already serving searches, which must not overlap a resize
+            with self._hnsw_lock:
+                hnsw.resize_index(matrix.shape[0])
+                hnsw.add_items(matrix[start:], np.arange(start, matrix.shape[0]))
+        return hnsw
+
+    def search(self, text, top_k=20, job_title="", location=""):
+        """
+        Find the stored postings most similar to a text (usually a resume).
+
+        With a job title or location, only postings matching them (see
+        JobStore.ids_matching) are candidates; those are scored exactly, and
+        the HNSW graph only serves unfiltered searches.
+        Returns:
+            list[dict]: Up to top_k jobs with a "Similarity Score", best first.
+        """
+        with self._lock:
+            ids, matrix, hnsw = self._ids, self._matrix, self._hnsw
+        if matrix is None or not len(ids) or not text:
+            return []
+
+        candidate_rows = None
+        if job_title or location:
+            candidate_rows = np.flatnonzero(np.isin(ids, self.store.ids_matching(job_title, location)))
+            if not len(candidate_rows):
+                return []
+        top_k = max(1, min(int(top_k), len(ids) if candidate_rows is None else len(candidate_rows)))
+
+        # The resume's vector is shared with the other scoring paths through the resume cache
+        from resume_cache import get_resume_features
+        resume_features = get_resume_features(text)
+        if self.mode == "tfidf":
+            from idf_model import get_idf_model
+            query = resume_features.tfidf_vector(get_idf_model()).toarray().ravel()
+            # Terms the index has never seen cannot match any indexed row
+            query = np.pad(query, (0, max(matrix.shape[1] - len(query), 0)))[:matrix.shape[1]]
+        else:
+            from doc2vec_model import get_doc2vec_model
+            query = resume_features.doc2vec_vector(get_doc2vec_model())
+
+        if candidate_rows is not None:
+            rows, scores = top_k_blocked(matrix[candidate_rows], query, top_k)
+            rows = candidate_rows[rows]
+        elif hnsw is not None:
+            with self._hnsw_lock:
+                labels, distances = hnsw.knn_query(query.reshape(1, -1).astype(np.float32), k=top_k)
+            # Rows added by a refresh after ids was read are not in this snapshot
+            keep = labels[0] < len(ids)
+            rows, scores = labels[0][keep].astype(np.int64), 1.0 - distances[0][keep]
+        else:
+            rows, scores = top_k_blocked(matrix, query, top_k)
+
+        found = self.store.get_jobs_by_id(ids[rows])
+        jobs = []
+        for job_id, score in zip(ids[rows], scores):
+            job = found.get(int(job_id))
+            if job is not None:
+                job["Similarity Score"] = round(float(score), 4)
+                jobs.append(job)
+        return jobs
+
+
+_store = None
+_indexes = {}
+_lock = threading.RLock()
+
+
+def get_job_store():
+    """
+    Return the process-wide job store, opening it on first use.
+    """
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = JobStore()
+    return _store
+
+
+def get_job_index(mode="tfidf"):
+    """
+    Return the process-wide index for a scoring mode, creating it on first use.
+    """
+    if mode not in _indexes:
+        with _lock:
+            if mode not in _indexes:
+                _indexes[mode] = JobIndex(get_job_store(), mode, path=JOB_INDEX_DIR)
+    return _indexes[mode]
@@ -0,0 +1,229 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import SingleFlight, SqliteCache, TTLCache, TieredCache, make_key
+from storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# OpenAI-compatible chat completions API (DEEPSEEK_BASE_URL can point at a local mock)
+DEFAULT_BASE_URL = "https://api.deepseek.com/v1"
+DEFAULT_MODEL = "deepseek-chat"
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+def normalize_prompt(prompt):
+    """
+    Collapse whitespace so prompts that differ only in layout share a cache entry.
+    """
+    return " ".join(prompt.split())
+
+
+def prompt_digest(prompt):
+    """
+    SHA-256 hex digest of the normalized prompt, so cache keys (and the SQLite
+    cache file) never hold the prompt text, which may contain a resume.
+    """
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+class ChatClient:
+    """
+    Client for a chat completions API such as DeepSeek's.
+
+    Requests go through one pooled requests.Session with connect/read timeouts
+    and retries on connection errors and 429/5xx (honouring Retry-After); a
+    read timeout is not retried, as the API may already be generating the
+    reply. Completed replies are cached by model, temperature and a hash of
+    the normalized prompt, and concurrent calls
+    for the same prompt share a single request, so Streamlit reruns and
+    repeat analyses do not pay for the same completion twice.
+    Args:
+        base_url (str): API root, e.g. "https://api.deepseek.com/v1".
+        api_key (str): Bearer token.
+        cache: Object with get/set (e.g. TieredCache), or None to disable caching.
+        timeout (tuple): (connect, read) timeouts in seconds.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, model=DEFAULT_MODEL, cache=None,
+                 timeout=(5.0, 60.0), max_retries=3, backoff_factor=0.5, pool_size=4):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.cache = cache
+        self.timeout = timeout
+        self._inflight = SingleFlight()
+        self._session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            # The POST may have reached the API, so only retry failed connections and the statuses below
+            read=0,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRYABLE_STATUSES,
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({"Content-Type": "application/json"})
+        if api_key:
+            self._session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _payload(self, prompt, temperature):
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature
+        }
+
+    def _cache_key(self, prompt, temperature):
+        return make_key("chat", self.model, temperature, prompt_digest(prompt))
+
+    def _request(self, prompt, temperature):
+        try:
+            response = self._session.post(
+                f"{self.base_url}/chat/completions", json=self._payload(prompt, temperature), timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            logger.warning(f"Chat completion request failed: {str(e)}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"Chat completion returned status {response.status_code}")
+            return None
+        try:
+            return response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError) as e:
+            logger.warning(f"Malformed chat completion response: {str(e)}")
+            return None
+
+    def complete(self, prompt, temperature=0.7, use_cache=True):
+        """
+        Return the model's reply to a single-message prompt.
+        Returns:
+            str or None: The reply text, or None when the request failed.
+                Failures are not cached.
+        """
+        if self.cache is None or not use_cache:
+            return self._request(prompt, temperature)
+
+        key = self._cache_key(prompt, temperature)
+        reply = self.cache.get(key)
+        if reply is not None:
+            return reply
+
+        def request_and_cache():
+            reply = self._request(prompt, temperature)
+            if reply is not None:
+                self.cache.set(key, reply)
+            return reply
+
+        reply, _ = self._inflight.do(key, request_and_cache)
+        return reply
+
+    def stream(self, prompt, temperature=0.7, use_cache=True):
+        """
+        Yield the model's reply in pieces as the API streams them (server-sent
+        events). A cached reply is yielded whole, and a reply streamed to the
+        end is cached for complete() and later streams.
+        Yields:
+            str: Reply text fragments; nothing when the request failed.
+        """
+        key = self._cache_key(prompt, temperature)
+        if self.cache is not None and use_cache:
+            reply = self.cache.get(key)
+            if reply is not None:
+                yield reply
+                return
+
+        payload = dict(self._payload(prompt, temperature), stream=True)
+        try:
+            response = self._session.post(
+                f"{self.base_url}/chat/completions", json=payload, timeout=self.timeout, stream=True
+            )
+        except requests.RequestException as e:
+            logger.warning(f"Chat completion request failed: {str(e)}")
+            return
+
+        with response:
+            if response.status_code != 200:
+                logger.warning(f"Chat completion returned status {response.status_code}")
+                return
+            response.encoding = "utf-8"
+            parts = []
+            finished = False
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        finished = True
+                        break
+                    try:
+                        piece = json.loads(data)["choices"][0]["delta"].get("content")
+                    except (ValueError, KeyError, IndexError):
+                        continue
+                    if piece:
+                        parts.append(piece)
+                        yield piece
+            except requests.RequestException as e:
+                logger.warning(f"Chat completion stream interrupted: {str(e)}")
+                return
+
+        if finished and parts and self.cache is not None:
+            self.cache.set(key, "".join(parts))
+
+    def close(self):
+        self._session.close()
+
+
+_chat_client = None
+_chat_client_lock = threading.Lock()
+
+
+def get_chat_client():
+    """
+    Return the process-wide DeepSeek client, creating it on first use.
+
+    Configuration is read from the environment at that point: DEEPSEEK_BASE_URL,
+    DEEPSEEK_MODEL, DEEPSEEK_API_KEY, timeouts and retries. Replies are cached
+    for LLM_CACHE_TTL seconds in memory and in the SQLite file LLM_CACHE_DB
+    (set it to an empty string to keep the cache in memory only).
+    """
+    global _chat_client
+    if _chat_client is None:
+        with _chat_client_lock:
+            if _chat_client is None:
+                ttl = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+                cache_db = os.getenv("LLM_CACHE_DB", os.path.join(DATA_DIR, "llm_cache.db"))
+                memory = TTLCache(maxsize=int(os.getenv("LLM_CACHE_SIZE", "256")), ttl=ttl)
+                disk = SqliteCache(cache_db, ttl=ttl) if cache_db else None
+                _chat_client = ChatClient(
+                    base_url=os.getenv("DEEPSEEK_BASE_URL", DEFAULT_BASE_URL),
+                    api_key=os.getenv("DEEPSEEK_API_KEY"),
+                    model=os.getenv("DEEPSEEK_MODEL", DEFAULT_MODEL),
+                    cache=TieredCache(memory, disk),
+                    timeout=(float(os.getenv("DEEPSEEK_CONNECT_TIMEOUT", "5")),
+                             float(os.getenv("DEEPSEEK_READ_TIMEOUT", "60"))),
+                    max_retries=int(os.getenv("DEEPSEEK_MAX_RETRIES", "3")),
+                )
+                atexit.register(_chat_client.close)
+    return _chat_client
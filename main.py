@@ -1,18 +1,123 @@
 import subprocess
+import sys
+import threading
 import time
 import os
+import urllib.request
+
+BACKEND_PORT = int(os.getenv("BACKEND_PORT", "5004"))
+HEALTH_URL = f"http://127.0.0.1:{BACKEND_PORT}/healthz"
+
+# How long the backend may take to come up, how often it is checked afterwards,
+# and how many failed checks in a row trigger a restart
+STARTUP_TIMEOUT = float(os.getenv("BACKEND_STARTUP_TIMEOUT", "120"))
+HEALTH_CHECK_INTERVAL = float(os.getenv("BACKEND_HEALTH_INTERVAL", "10"))
+HEALTH_CHECK_FAILURES = int(os.getenv("BACKEND_HEALTH_FAILURES", "3"))
+
+# Seconds to wait for a graceful stop before killing the backend
+STOP_TIMEOUT = float(os.getenv("BACKEND_STOP_TIMEOUT", "35"))
+
+def backend_command():
+    """Gunicorn where it is available (not on Windows), otherwise Flask's own server."""
+    if os.name != "nt":
+        try:
+            import gunicorn  # noqa: F401
+            return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:application"]
+        except ImportError:
+            pass
+    return [sys.executable, "app.py"]
 
 def start_backend():
-    """Start the backend Flask server (app.py)."""
-    print("Starting the backend server...")
-    return subprocess.Popen(["python", "app.py"])
+    """Start the backend API server."""
+    command = backend_command()
+    print(f"Starting the backend server ({' '.join(command[1:])})...")
+    # No debug reloader when the supervisor owns the process
+    return subprocess.Popen(command, env=dict(os.environ, FLASK_DEBUG="false"))
+
+def is_healthy(timeout=5):
+    """Whether the backend answers its health check."""
+    try:
+        with urllib.request.urlopen(HEALTH_URL, timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+def wait_until_healthy(process, timeout=STARTUP_TIMEOUT):
+    """Wait for a freshly started backend to pass its health check."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        if is_healthy():
+            return True
+        time.sleep(0.5)
+    return False
+
+def stop_backend(process):
+    """Ask the backend to shut down gracefully, then kill it if it does not."""
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    print("Backend server has been stopped.")
+
+class BackendSupervisor:
+    """Keeps the backend running: restarts it when it exits or stops passing health checks."""
+
+    def __init__(self):
+        self.process = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.process = start_backend()
+        if wait_until_healthy(self.process):
+            print("Backend server is ready.")
+        else:
+            print("Backend server did not become healthy in time, continuing to monitor it.")
+        self._thread = threading.Thread(target=self._monitor, name="backend-supervisor", daemon=True)
+        self._thread.start()
+
+    def _monitor(self):
+        failures = 0
+        while not self._stopping.wait(HEALTH_CHECK_INTERVAL):
+            if self.process.poll() is not None:
+                print(f"Backend server exited with code {self.process.returncode}, restarting...")
+            elif is_healthy():
+                failures = 0
+                continue
+            else:
+                failures += 1
+                print(f"Backend health check failed ({failures}/{HEALTH_CHECK_FAILURES})")
+                if failures < HEALTH_CHECK_FAILURES:
+                    continue
+                print("Backend server is unresponsive, restarting...")
+                stop_backend(self.process)
+
+            if self._stopping.is_set():
+                return
+            failures = 0
+            self.process = start_backend()
+            wait_until_healthy(self.process)
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=STOP_TIMEOUT)
+        if self.process is not None:
+            stop_backend(self.process)
 
 def main():
     """Main function to run the Streamlit app."""
     # Check if this is the initial run to start backend
     if "RUNNING_STREAMLIT" not in os.environ:
-        # Start the backend
-        backend_process = start_backend()
+        # Start the backend and keep it healthy while Streamlit runs
+        supervisor = BackendSupervisor()
+        supervisor.start()
         try:
             # Set an environment variable to avoid recursion
             os.environ["RUNNING_STREAMLIT"] = "true"
@@ -20,11 +125,9 @@ def main():
             subprocess.run(["streamlit", "run", "streamlit_app.py"], check=True)
         finally:
             # Stop the backend when Streamlit exits
-            if backend_process.poll() is None:
-                backend_process.terminate()
-                print("Backend server has been stopped.")
+            supervisor.stop()
     else:
         print("Streamlit is already running, skipping backend initialization.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,96 @@
+import hashlib
+import os
+import threading
+
+from cache import TTLCache
+from text_processing import get_token_stream
+
+# Number of distinct resumes whose derived features are kept in memory
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "512"))
+
+
+class ResumeFeatures:
+    """
+    Everything derived from one resume text, computed on first use and kept.
+
+    Vectors are remembered per model (and per IDF model version), so the
+    TF-IDF, Doc2Vec and keyword paths all share one copy of the resume's
+    processed form, and repeat submissions of the same resume skip the work.
+    """
+
+    def __init__(self, text, content_hash):
+        self.text = text
+        self.content_hash = content_hash
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _memoize(self, key, compute):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        value = compute()
+        with self._lock:
+            return self._values.setdefault(key, value)
+
+    def _memoize_latest(self, key, tag, compute):
+        # Keep only the value for the newest tag, e.g. the current model version
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and cached[0] == tag:
+                return cached[1]
+        value = compute()
+        with self._lock:
+            self._values[key] = (tag, value)
+        return value
+
+    def tokens(self):
+        """
+        The resume's shared token stream, as read by every scorer.
+        """
+        return self._memoize("tokens", lambda: get_token_stream(self.text).tokens)
+
+    def tfidf_vector(self, idf_model):
+        """
+        L2-normalized TF-IDF row for the resume under the model's current weights.
+        """
+        return self._memoize_latest(
+            "tfidf_vector", (id(idf_model), idf_model.version),
+            lambda: idf_model.transform_tokens([self.tokens()])
+        )
+
+    def doc2vec_vector(self, model):
+        """
+        L2-normalized inferred Doc2Vec vector for the resume.
+        """
+        from doc2vec_model import infer_vectors
+        return self._memoize_latest(
+            "doc2vec_vector", id(model),
+            lambda: infer_vectors(model, [self.tokens()])[0]
+        )
+
+    def keywords(self, extract_keywords):
+        """
+        Keyword set produced by the given extractor (e.g. resumerec.extract_keywords).
+        """
+        extractor_name = f"{extract_keywords.__module__}.{extract_keywords.__qualname__}"
+        # Frozen because the same set is handed to every caller
+        return self._memoize(("keywords", extractor_name), lambda: frozenset(extract_keywords(self.text)))
+
+
+_features = TTLCache(maxsize=RESUME_CACHE_SIZE)
+
+
+def resume_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_resume_features(text):
+    """
+    Return the shared ResumeFeatures for a resume, keyed by a hash of its content.
+    """
+    content_hash = resume_hash(text)
+    features = _features.get(content_hash)
+    if features is None:
+        features = ResumeFeatures(text, content_hash)
+        _features.set(content_hash, features)
+    return features
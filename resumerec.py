@@ -1,84 +1,95 @@
-import streamlit as st
-import requests
-import spacy
-import PyPDF2
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from document_extraction import DocumentExtractionError, extract_text_from_upload
+from llm_client import get_chat_client
+from resume_cache import get_resume_features
+from skill_taxonomy import get_skill_taxonomy
+from text_processing import get_token_stream, get_token_streams
 
 # Load environment variables
 load_dotenv()
 
-# Load NLP Model
-nlp = spacy.load("en_core_web_sm")
-
 # DeepSeek API Key (Set your API key here)
 DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
 
-# Function to extract text from resume
+# Whether get_job_skills asks DeepSeek for extra skills when an API key is set
+SKILL_LLM_ENRICHMENT = os.getenv("SKILL_LLM_ENRICHMENT", "true").lower() == "true"
+
+# Sampling temperatures: the skills list is looked up deterministically so its
+# cached reply is representative; tips keep some variety
+SKILLS_TEMPERATURE = float(os.getenv("SKILLS_TEMPERATURE", "0"))
+TIPS_TEMPERATURE = float(os.getenv("TIPS_TEMPERATURE", "0.7"))
+
+TIPS_ERROR_MESSAGE = "Error fetching resume improvement suggestions from DeepSeek API."
+
+# Background workers for the analysis flow, started on first use
+_analysis_executor = None
+_analysis_executor_lock = threading.Lock()
+
+# Function to extract text from resume; problems are reported as the returned text
 def extract_text_from_file(uploaded_file):
     if uploaded_file is not None:
-        file_extension = uploaded_file.name.split(".")[-1].lower()
-
-        # Extract from PDF
-        if file_extension == "pdf":
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-
-        # Extract from DOCX
-        elif file_extension == "docx":
-            doc = docx.Document(uploaded_file)
-            text = "\n".join([para.text for para in doc.paragraphs])
-            return text.strip()
-
-        # Extract from TXT
-        elif file_extension == "txt":
-            return uploaded_file.read().decode("utf-8").strip()
-
-        else:
-            return "Unsupported file format. Please upload a PDF, DOCX, or TXT file."
+        try:
+            return extract_text_from_upload(uploaded_file)
+        except DocumentExtractionError as e:
+            return str(e)
     return ""
 
-# Extract key skills from text
+# Extract taxonomy skills (canonical names, synonyms resolved) from text
+def extract_skills(text):
+    return get_skill_taxonomy().match(text)
+
+# spaCy's English stop words; importing spaCy takes about a second, so only
+# the keyword functions that need them pay for it
+def _stop_words():
+    from spacy.lang.en.stop_words import STOP_WORDS
+    return STOP_WORDS
+
+# Extract keywords from text, reusing the shared token stream
 def extract_keywords(text):
-    doc = nlp(text)
-    keywords = [token.text.lower() for token in doc if token.is_alpha and not token.is_stop]
-    return set(keywords)
-
-# Get job-specific skills using DeepSeek API
-def get_job_skills(job_title):
-    url = "https://api.deepseek.com/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    return get_token_stream(text).keywords(_stop_words())
+
+# Extract keywords from many texts (e.g. job descriptions) in one batched pass
+def extract_keywords_batch(texts, batch_size=256):
+    stop_words = _stop_words()
+    return [stream.keywords(stop_words) for stream in get_token_streams(texts, batch_size=batch_size)]
+
+# Get job-specific skills: the local taxonomy's skills for the role, optionally
+# enriched with skills named in a DeepSeek reply (cached per title)
+def get_job_skills(job_title, enrich=None):
+    if enrich is None:
+        enrich = SKILL_LLM_ENRICHMENT and bool(DEEPSEEK_API_KEY)
+    skills = get_skill_taxonomy().skills_for_role(job_title)
+    if enrich:
+        skills = skills | get_llm_job_skills(job_title)
+    return skills
+
+# Skills from a DeepSeek description of the role, matched against the taxonomy
+def get_llm_job_skills(job_title):
+    reply = fetch_job_skills_description(job_title)
+    return extract_skills(reply) if reply else frozenset()
+
+# Ask DeepSeek for the essential skills of a role; None on failure. The title is
+# normalized so every spelling of a role shares one cached reply
+def fetch_job_skills_description(job_title):
+    job_title = " ".join(job_title.lower().split())
     prompt = f"List the essential skills for a {job_title} role, categorized as: Hard Skills (technical) and Soft Skills (communication, teamwork)."
-    
-    payload = {
-        "model": "deepseek-chat",
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.7
-    }
+    return get_chat_client().complete(prompt, temperature=SKILLS_TEMPERATURE)
 
-    response = requests.post(url, headers=headers, json=payload)
-    
-    if response.status_code == 200:
-        return response.json()["choices"][0]["message"]["content"]
-    else:
-        return "Error fetching job skills from DeepSeek API."
-
-# Analyze resume for job match
+# Analyze resume for job match. job_skills is a collection of taxonomy skills
+# (see get_job_skills) or free text to match skills in
 def analyze_resume(resume_text, job_skills):
-    resume_keywords = extract_keywords(resume_text)
-    job_keywords = extract_keywords(job_skills)
+    # Resume skills are cached by content hash, so reruns skip the matching pass
+    resume_skills = get_resume_features(resume_text).keywords(extract_skills)
+    job_skills = extract_skills(job_skills) if isinstance(job_skills, str) else frozenset(job_skills)
 
-    matched_skills = resume_keywords.intersection(job_keywords)
-    missing_skills = job_keywords - resume_keywords
+    matched_skills = resume_skills.intersection(job_skills)
+    missing_skills = job_skills - resume_skills
 
     # Resume Strength Score (Percentage of job-related skills present)
-    strength_score = round((len(matched_skills) / len(job_keywords)) * 100, 2) if job_keywords else 0
+    strength_score = round((len(matched_skills) / len(job_skills)) * 100, 2) if job_skills else 0
 
     return {
         "matched_skills": matched_skills,
@@ -86,22 +97,18 @@ def analyze_resume(resume_text, job_skills):
         "strength_score": strength_score
     }
 
-# DeepSeek API - Generate Resume Improvement Suggestions
-def get_resume_improvement_tips(resume_text, job_title, matched_skills, missing_skills):
-    url = "https://api.deepseek.com/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    prompt = f"""
+# Prompt for resume improvement suggestions. Skills are sorted so the same
+# analysis always produces the same (cached) prompt
+def build_resume_tips_prompt(resume_text, job_title, matched_skills, missing_skills):
+    return f"""
     I am applying for a {job_title} position.
 
     Here is my resume content:
     
     {resume_text}
 
-    My resume currently matches these skills: {', '.join(matched_skills)}.
-    However, I am missing these skills: {', '.join(missing_skills)}.
+    My resume currently matches these skills: {', '.join(sorted(matched_skills))}.
+    However, I am missing these skills: {', '.join(sorted(missing_skills))}.
 
     Provide brief and direct resume improvement suggestions:
     1. Two Ways to Improve Resume(Keep each point under 20 words).
@@ -110,16 +117,59 @@ def get_resume_improvement_tips(resume_text, job_title, matched_skills, missing_
         - Improved Version: Rewrite with measurable impact (use actual figures where possible).
     """
 
-    payload = {
-        "model": "deepseek-chat",
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.7
-    }
-
-    response = requests.post(url, headers=headers, json=payload)
-    
-    if response.status_code == 200:
-        return response.json()["choices"][0]["message"]["content"]
-    else:
-        return "Error fetching resume improvement suggestions from DeepSeek API."
-
+# DeepSeek API - Generate Resume Improvement Suggestions
+def get_resume_improvement_tips(resume_text, job_title, matched_skills, missing_skills):
+    prompt = build_resume_tips_prompt(resume_text, job_title, matched_skills, missing_skills)
+    tips = get_chat_client().complete(prompt, temperature=TIPS_TEMPERATURE)
+    if tips is None:
+        return TIPS_ERROR_MESSAGE
+    return tips
+
+# Same suggestions, yielded piece by piece as DeepSeek streams them
+def stream_resume_improvement_tips(resume_text, job_title, matched_skills, missing_skills):
+    prompt = build_resume_tips_prompt(resume_text, job_title, matched_skills, missing_skills)
+    received = False
+    for piece in get_chat_client().stream(prompt, temperature=TIPS_TEMPERATURE):
+        received = True
+        yield piece
+    if not received:
+        yield TIPS_ERROR_MESSAGE
+
+def _get_analysis_executor():
+    global _analysis_executor
+    if _analysis_executor is None:
+        with _analysis_executor_lock:
+            if _analysis_executor is None:
+                _analysis_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("ANALYSIS_WORKERS", "4")), thread_name_prefix="resume-analysis"
+                )
+    return _analysis_executor
+
+# Result of analyze_resume_for_job; the tips are requested only when read
+class ResumeAnalysis:
+    def __init__(self, job_title, resume_text, job_skills, result):
+        self.job_title = job_title
+        self.resume_text = resume_text
+        self.job_skills = job_skills
+        self.result = result
+
+    def stream_tips(self):
+        return stream_resume_improvement_tips(
+            self.resume_text, self.job_title, self.result["matched_skills"], self.result["missing_skills"]
+        )
+
+    def tips(self):
+        return "".join(self.stream_tips())
+
+# Whole resume analysis flow: the job skills lookup (possibly a DeepSeek call)
+# runs in the background while the resume text is extracted, so the tips
+# request that follows is the only round trip the caller waits for.
+# Returns None when the document has no text; raises DocumentExtractionError
+# when it cannot be read
+def analyze_resume_for_job(uploaded_file, job_title):
+    job_skills_future = _get_analysis_executor().submit(get_job_skills, job_title)
+    resume_text = extract_text_from_upload(uploaded_file)
+    job_skills = job_skills_future.result()
+    if not resume_text:
+        return None
+    return ResumeAnalysis(job_title, resume_text, job_skills, analyze_resume(resume_text, job_skills))
@@ -0,0 +1,181 @@
+import logging
+import queue
+import threading
+import time
+import traceback
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class SearchQueueFull(Exception):
+    """Raised when a search is submitted while the queue is at capacity."""
+
+
+class SearchHandle:
+    """
+    State of one submitted search, updated by the worker running it.
+    """
+
+    def __init__(self, search_id, params):
+        self.id = search_id
+        self.params = params
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.partial_results = []
+        self.results = None
+        self.error = None
+        self.version = 0
+        self._changed = threading.Condition()
+
+    def _update(self, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self._changed.notify_all()
+
+    def add_partial_results(self, jobs):
+        """
+        Publish jobs scored so far.
+        """
+        with self._changed:
+            self.partial_results.extend(jobs)
+            self.version += 1
+            self._changed.notify_all()
+
+    def finish(self, results):
+        self._update(status="done", results=results, finished_at=time.time())
+
+    def fail(self, error):
+        self._update(status="failed", error=error, finished_at=time.time())
+
+    def wait_for_change(self, since_version, timeout):
+        """
+        Block until the search changes after since_version, it finishes, or the timeout passes.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self.version > since_version or self.status in ("done", "failed"),
+                timeout=timeout
+            )
+
+    def snapshot(self):
+        with self._changed:
+            return {
+                "search_id": self.id,
+                "status": self.status,
+                "version": self.version,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "partial_results": list(self.partial_results),
+                "results": list(self.results) if self.results is not None else None,
+                "error": self.error,
+            }
+
+
+class SearchQueue:
+    """
+    Bounded queue of searches executed by a fixed pool of background workers.
+
+    submit() returns a search ID straight away, or raises SearchQueueFull when
+    max_pending searches are already waiting, so callers can push back with a
+    429 instead of piling up work. Workers are started on the first submit,
+    which keeps them out of any process that only imports this module.
+    Finished searches are kept for `retention` seconds.
+    Args:
+        run_search (callable): Called as run_search(handle) on a worker thread;
+            reports progress through the handle and returns the final results.
+        workers (int): Number of worker threads.
+        max_pending (int): Maximum number of searches waiting to start.
+        retention (float): Seconds to keep finished searches.
+    """
+
+    def __init__(self, run_search, workers=4, max_pending=32, retention=3600):
+        self.run_search = run_search
+        self.workers = workers
+        self.retention = retention
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._searches = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+
+    def _start_workers(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"search-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            handle = self._pending.get()
+            try:
+                handle._update(status="running", started_at=time.time())
+                handle.finish(self.run_search(handle))
+            except Exception as e:
+                logger.error(f"Search {handle.id} failed: {str(e)}")
+                logger.error("Exception traceback: %s", traceback.format_exc())
+                handle.fail(f"An internal error occurred: {str(e)}")
+            finally:
+                self._pending.task_done()
+
+    def _purge_finished(self):
+        oldest = time.time() - self.retention
+        with self._lock:
+            expired = [
+                search_id for search_id, handle in self._searches.items()
+                if handle.finished_at is not None and handle.finished_at < oldest
+            ]
+            for search_id in expired:
+                del self._searches[search_id]
+
+    def submit(self, params):
+        """
+        Queue a search.
+        Returns:
+            str: The new search ID.
+        Raises:
+            SearchQueueFull: When max_pending searches are already waiting, or
+                the queue has been shut down.
+        """
+        if self._closed:
+            raise SearchQueueFull("The server is shutting down, try again later")
+        self._start_workers()
+        self._purge_finished()
+        handle = SearchHandle(uuid.uuid4().hex, params)
+        with self._lock:
+            self._searches[handle.id] = handle
+        try:
+            self._pending.put_nowait(handle)
+        except queue.Full:
+            with self._lock:
+                del self._searches[handle.id]
+            raise SearchQueueFull("Too many searches are waiting, try again later")
+        return handle.id
+
+    def get(self, search_id):
+        """
+        Return the handle for a search, or None if it is unknown or expired.
+        """
+        with self._lock:
+            return self._searches.get(search_id)
+
+    def pending_count(self):
+        return self._pending.qsize()
+
+    def shutdown(self, timeout=None):
+        """
+        Stop accepting searches and wait for queued and running ones to finish.
+        Returns:
+            bool: True if every search finished within the timeout.
+        """
+        self._closed = True
+        with self._pending.all_tasks_done:
+            return self._pending.all_tasks_done.wait_for(lambda: self._pending.unfinished_tasks == 0, timeout)
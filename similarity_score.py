@@ -1,24 +1,25 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from gensim.models.doc2vec import Doc2Vec, TaggedDocument
-import nltk
-from nltk_setup import setup_nltk
-
-# Initialize NLTK
-setup_nltk()
+# scikit-learn and gensim are imported inside the functions that need them:
+# the serving path scores with the IDF model and the pre-trained Doc2Vec model,
+# so importing this module stays cheap
+from text_processing import get_token_stream, get_token_streams, normalize, split_sentences, tokenize
+from doc2vec_model import get_doc2vec_model, infer_vectors
+from resume_cache import get_resume_features
 
 def preprocess_text_for_doc2vec(text):
     """
     Preprocess text by tokenizing into sentences and words (for Doc2Vec).
     """
-    sentences = nltk.sent_tokenize(text.lower())
-    return [nltk.word_tokenize(sentence) for sentence in sentences]
+    return [tokenize(sentence) for sentence in split_sentences(text)]
 
 def preprocess_text_for_tfidf(text):
     """
     Preprocess text by lowercasing and removing extra spaces (for TF-IDF).
     """
-    return " ".join(text.lower().split())
+    return normalize(text)
+
+def _tokens(tokens):
+    # Analyzer for TfidfVectorizer when documents arrive already tokenized
+    return tokens
 
 def calculate_similarity_tfidf(resume, job_description):
     """
@@ -32,15 +33,72 @@ def calculate_similarity_tfidf(resume, job_description):
     if not resume or not job_description:
         return 0.0  # Handle empty inputs
 
-    resume = preprocess_text_for_tfidf(resume)
-    job_description = preprocess_text_for_tfidf(job_description)
-    
-    documents = [resume, job_description]
-    tfidf_vectorizer = TfidfVectorizer()
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    documents = [get_token_stream(resume).tokens, get_token_stream(job_description).tokens]
+    tfidf_vectorizer = TfidfVectorizer(analyzer=_tokens)
     tfidf_matrix = tfidf_vectorizer.fit_transform(documents)
     similarity_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
     return similarity_score
 
+def calculate_similarity_tfidf_batch(resume, job_descriptions, idf_model=None):
+    """
+    Calculate TF-IDF cosine similarity between one resume and many job descriptions.
+
+    The resume and all job descriptions are vectorized with a single fit, and
+    every job is scored with one sparse matrix-vector product, so the cost
+    grows with the total amount of text rather than with the number of jobs.
+    When a fitted corpus-level IDF model is given, it is used instead of
+    fitting on this batch, which keeps scores comparable across requests.
+    Args:
+        resume (str): Text of the resume.
+        job_descriptions (list[str]): Texts of the job descriptions.
+        idf_model (IdfModel, optional): Warm corpus-level IDF model.
+    Returns:
+        list[float]: Similarity score between 0 and 1 for each job description,
+        in the same order. Empty descriptions score 0.0.
+    """
+    scores = [0.0] * len(job_descriptions)
+    if not resume:
+        return scores
+
+    # Only vectorize the non-empty descriptions; the rest keep a score of 0.0
+    indices = [i for i, description in enumerate(job_descriptions) if description]
+    if not indices:
+        return scores
+
+    resume_features = get_resume_features(resume)
+
+    if idf_model is not None and idf_model.num_documents > 0:
+        similarities = idf_model.score(
+            resume, [job_descriptions[i] for i in indices],
+            resume_vector=resume_features.tfidf_vector(idf_model)
+        )
+        for i, similarity in zip(indices, similarities):
+            scores[i] = similarity
+        return scores
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    documents = [resume_features.tokens()]
+    documents.extend(stream.tokens for stream in get_token_streams([job_descriptions[i] for i in indices]))
+
+    tfidf_vectorizer = TfidfVectorizer(analyzer=_tokens)
+    try:
+        tfidf_matrix = tfidf_vectorizer.fit_transform(documents)
+    except ValueError:
+        # Raised when no document contains a single token (empty vocabulary)
+        return scores
+
+    # Rows are L2-normalized by TfidfVectorizer, so the dot product is the cosine
+    resume_vector = tfidf_matrix[0].T
+    similarities = (tfidf_matrix[1:] @ resume_vector).toarray().ravel()
+
+    for i, similarity in zip(indices, similarities):
+        scores[i] = float(similarity)
+    return scores
+
 def calculate_similarity_doc2vec(resume, job_description):
     """
     Calculate similarity using Doc2Vec and cosine similarity.
@@ -53,6 +111,14 @@ def calculate_similarity_doc2vec(resume, job_description):
     if not resume or not job_description:
         return 0.0  # Handle empty inputs
 
+    # Prefer the pre-trained model; training per pair is only a fallback until one is built
+    model = get_doc2vec_model()
+    if model is not None:
+        return calculate_similarity_doc2vec_batch(resume, [job_description], model=model)[0]
+
+    from gensim.models.doc2vec import Doc2Vec, TaggedDocument
+    from sklearn.metrics.pairwise import cosine_similarity
+
     # Preprocess the text
     resume_sentences = preprocess_text_for_doc2vec(resume)
     job_sentences = preprocess_text_for_doc2vec(job_description)
@@ -80,4 +146,40 @@ def calculate_similarity_doc2vec(resume, job_description):
 
     # Calculate cosine similarity
     similarity_score = cosine_similarity([resume_vector], [job_vector])[0][0]
-    return similarity_score
\ No newline at end of file
+    return similarity_score
+
+def calculate_similarity_doc2vec_batch(resume, job_descriptions, model=None):
+    """
+    Calculate Doc2Vec cosine similarity between one resume and many job descriptions.
+
+    Uses the pre-trained model (see doc2vec_model.py) for inference only: the
+    resume is inferred once, every job description once, and all of them are
+    scored with a single matrix-vector product.
+    Args:
+        resume (str): Text of the resume.
+        job_descriptions (list[str]): Texts of the job descriptions.
+        model (Doc2Vec, optional): Trained model; defaults to the shared one.
+    Returns:
+        list[float]: One score per job description, 0.0 for empty descriptions.
+    Raises:
+        RuntimeError: If no pre-trained model is available.
+    """
+    scores = [0.0] * len(job_descriptions)
+    if not resume or not job_descriptions:
+        return scores
+
+    model = model or get_doc2vec_model()
+    if model is None:
+        raise RuntimeError("No pre-trained Doc2Vec model found, run `python doc2vec_model.py` first")
+
+    indices = [i for i, description in enumerate(job_descriptions) if description]
+    if not indices:
+        return scores
+
+    streams = get_token_streams([job_descriptions[i] for i in indices])
+    job_vectors = infer_vectors(model, [stream.tokens for stream in streams])
+    similarities = job_vectors @ get_resume_features(resume).doc2vec_vector(model)
+
+    for i, similarity in zip(indices, similarities):
+        scores[i] = float(similarity)
+    return scores
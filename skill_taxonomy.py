@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import threading
+
+# JSON file of skills (with category and synonyms) and the skills each role needs
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+)
+
+# Skill tokens keep the punctuation inside names like "c++", "node.js" or "ci/cd",
+# but not trailing sentence punctuation
+SKILL_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./&'-][a-z0-9+#]+)*")
+
+_MATCH = object()
+
+
+def skill_tokens(text):
+    """
+    Lowercased tokens of a text, as the skill matcher reads them.
+    """
+    return SKILL_TOKEN_PATTERN.findall(text.lower())
+
+
+class PhraseMatcher:
+    """
+    Multi-pattern matcher over a token trie.
+
+    Every phrase is stored once in the trie, so a text is matched against all
+    of them in a single left-to-right pass, taking the longest phrase that
+    starts at each position (e.g. "machine learning engineer" before
+    "machine learning").
+    Args:
+        phrases (dict): Phrase text -> value returned when it matches.
+    """
+
+    def __init__(self, phrases):
+        self._root = {}
+        for phrase, value in phrases.items():
+            tokens = skill_tokens(phrase)
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_MATCH] = value
+
+    def find(self, tokens):
+        """
+        Values of the phrases found in a token list, in order of appearance.
+        """
+        found = []
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            end = None
+            j = i
+            while j < len(tokens):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _MATCH in node:
+                    end, value = j, node[_MATCH]
+            if end is None:
+                i += 1
+            else:
+                found.append(value)
+                i = end
+        return found
+
+
+class SkillTaxonomy:
+    """
+    Local dictionary of skills, their synonyms, and the skills expected for
+    common roles. Lets resume analysis run offline without asking an LLM.
+    Args:
+        data (dict): {"skills": {name: {"category", "synonyms"}},
+            "roles": {name: {"aliases", "skills"}}}.
+    """
+
+    def __init__(self, data):
+        self.skills = data.get("skills", {})
+        self.roles = {}
+        for role, entry in data.get("roles", {}).items():
+            unknown = [skill for skill in entry.get("skills", []) if skill not in self.skills]
+            if unknown:
+                raise ValueError(f"Role '{role}' lists unknown skills: {', '.join(unknown)}")
+            self.roles[role] = frozenset(entry.get("skills", []))
+
+        skill_phrases = {}
+        for skill, entry in self.skills.items():
+            for phrase in [skill] + entry.get("synonyms", []):
+                skill_phrases[phrase] = skill
+        self._skill_matcher = PhraseMatcher(skill_phrases)
+
+        role_phrases = {}
+        for role, entry in data.get("roles", {}).items():
+            for phrase in [role] + entry.get("aliases", []):
+                role_phrases[phrase] = role
+        self._role_matcher = PhraseMatcher(role_phrases)
+
+    @classmethod
+    def load(cls, path=SKILL_TAXONOMY_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def match(self, text):
+        """
+        Canonical names of the skills mentioned in a text, synonyms included.
+        Returns:
+            frozenset[str]
+        """
+        return frozenset(self._skill_matcher.find(skill_tokens(text or "")))
+
+    def match_roles(self, job_title):
+        """
+        Roles named in a job title, e.g. "Senior Data Scientist" -> {"data scientist"}.
+        """
+        return frozenset(self._role_matcher.find(skill_tokens(job_title or "")))
+
+    def skills_for_role(self, job_title):
+        """
+        Skills expected for a job title: the union over every role it names.
+        Returns:
+            frozenset[str]: Empty when the title names no known role.
+        """
+        skills = set()
+        for role in self.match_roles(job_title):
+            skills.update(self.roles[role])
+        return frozenset(skills)
+
+    def category(self, skill):
+        """
+        "hard" or "soft", or None for a skill outside the taxonomy.
+        """
+        entry = self.skills.get(skill)
+        return entry.get("category") if entry else None
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_skill_taxonomy():
+    """
+    Return the process-wide skill taxonomy, loading it on first use.
+    """
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.load()
+    return _taxonomy
@@ -0,0 +1,4 @@
+import os
+
+# Root directory for models, caches and other state the service keeps on disk
+DATA_DIR = os.getenv("JOBGENIE_DATA_DIR", os.path.expanduser("~/.jobgenie"))
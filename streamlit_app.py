@@ -1,13 +1,17 @@
 import streamlit as st
 import requests
 import pandas as pd
-from PyPDF2 import PdfReader
+import json
+import importlib.util
+from document_extraction import DocumentExtractionError, extract_text_from_upload
 from io import BytesIO  # For creating in-memory Excel files
-from nltk_setup import setup_nltk
 import resumerec
 
-# Initialize NLTK once at startup
-setup_nltk()
+# XlsxWriter writes large sheets considerably faster than openpyxl
+EXCEL_ENGINE = "xlsxwriter" if importlib.util.find_spec("xlsxwriter") else "openpyxl"
+
+# Columns of the table shown while results stream in
+PROGRESS_COLUMNS = ["Title", "Company", "Location", "Similarity Score"]
 
 # Streamlit Page Configuration
 st.set_page_config(page_title="JobGenie", layout="wide")
@@ -19,22 +23,16 @@ tab1, tab2 = st.tabs(["🔍 Find Jobs", "📄 Resume Analysis"])
 with tab1:
     st.subheader("Upload your resume and find the best jobs for you!")
 
-    # Resume Upload Function
-    def extract_text_from_pdf(file):
-        reader = PdfReader(file)
-        text = " ".join(page.extract_text() for page in reader.pages)
-        return text
-
     # Resume Upload
     uploaded_file = st.file_uploader("Upload your resume (PDF or Word)", type=["pdf", "docx"])
+    resume_text = None
     if uploaded_file:
-        if uploaded_file.type == "application/pdf":
-            resume_text = extract_text_from_pdf(uploaded_file)
-        else:
-            resume_text = uploaded_file.read().decode("utf-8", errors="ignore")
-        st.success("Resume uploaded successfully!")
-    else:
-        resume_text = None
+        try:
+            # Cached by file hash, so reruns of this script do not extract again
+            resume_text = extract_text_from_upload(uploaded_file)
+            st.success("Resume uploaded successfully!")
+        except DocumentExtractionError as e:
+            st.error(str(e))
 
     # Job Search Inputs
     job_title = st.text_input("Enter job title:")
@@ -54,26 +52,48 @@ with tab1:
             st.error("Please upload a resume and provide a job title!")
         else:
             # Show loading message
-            with st.spinner('Searching for jobs... This may take a few minutes...'):
+            with st.spinner('Searching for jobs... Results appear as they are scored...'):
                 st.info(f"Searching for {job_title} jobs in {job_location if job_location else 'any location'}")
-                # Call the backend API
+                # Call the streaming backend API and render jobs as they arrive
                 try:
-                    response = requests.post("http://127.0.0.1:5004/recommend_jobs", json={
+                    response = requests.post("http://127.0.0.1:5004/recommend_jobs/stream", json={
                         "resume": resume_text,
                         "job_title": job_title,
                         "location": job_location,
                         "days_old": 7,
                         "num_pages": num_pages,
                         "include_indeed": 0,
-                        "include_linkedin": 1
-                    })
+                        "include_linkedin": 1,
+                        "columnar": True
+                    }, stream=True)
 
                     if response.status_code == 200:
-                        jobs = response.json()
-                        if jobs:
-                            # Convert JSON response to DataFrame
-                            jobs_df = pd.DataFrame(jobs)
-
+                        progress_text = st.empty()
+                        progress_table = st.empty()
+                        jobs_df = None
+                        streamed_jobs = []
+                        for line in response.iter_lines(decode_unicode=True):
+                            if not line:
+                                continue
+                            event = json.loads(line)
+                            if event["type"] == "job":
+                                streamed_jobs.append(event["job"])
+                            elif event["type"] == "page":
+                                # Redrawn once per page, in arrival order; the summary comes sorted
+                                progress_text.write(f"Scored {len(streamed_jobs)} jobs so far...")
+                                progress_table.dataframe(pd.DataFrame(streamed_jobs, columns=PROGRESS_COLUMNS))
+                            elif event["type"] == "summary":
+                                # Columnar summary, already ranked: column name -> list of values
+                                jobs_df = pd.DataFrame(event["columns"])
+                            elif event["type"] == "error":
+                                st.error(event["error"])
+                                jobs_df = pd.DataFrame(streamed_jobs)
+                                if streamed_jobs:
+                                    jobs_df = jobs_df.sort_values("Similarity Score", ascending=False)
+                        progress_text.empty()
+                        progress_table.empty()
+
+                        if jobs_df is not None:
                             # Select and display relevant columns
                             if not jobs_df.empty:
                                 st.write("Recommended Jobs:")
@@ -92,12 +112,17 @@ with tab1:
                                     }
                                 )
 
+                                # Links of merged duplicate postings, one cell per job
+                                export_df = jobs_df
+                                if "Other Links" in jobs_df:
+                                    export_df = jobs_df.assign(**{"Other Links": jobs_df["Other Links"].str.join(" ")})
+
                                 # Save the DataFrame as CSV
-                                csv_data = jobs_df.to_csv(index=False)
+                                csv_data = export_df.to_csv(index=False)
 
                                 # Save the DataFrame as Excel using BytesIO
                                 excel_buffer = BytesIO()
-                                jobs_df.to_excel(excel_buffer, index=False, engine='openpyxl')
+                                export_df.to_excel(excel_buffer, index=False, engine=EXCEL_ENGINE)
                                 excel_data = excel_buffer.getvalue()
 
                                 # Download Buttons
@@ -136,23 +161,24 @@ with tab2:
 
     # Analyze Resume Button
     if uploaded_file and job_title:
-        with st.spinner("Fetching job-specific skills..."):
-            job_skills = resumerec.get_job_skills(job_title)
-
+        # Job skills are looked up while the resume text is extracted
         with st.spinner("Analyzing Resume..."):
-            resume_text = resumerec.extract_text_from_file(uploaded_file)
-            if resume_text:
-                result = resumerec.analyze_resume(resume_text, job_skills)
-
-                # Chatbot Response
-                st.subheader("🔍 Resume Analysis Report")
-                st.write(f"*Impact Strength Score:* {result['strength_score']}%")
-
-                # DeepSeek-Powered Resume Improvement Suggestions
-                with st.spinner("Generating AI Resume Tips..."):
-                    resume_tips = resumerec.get_resume_improvement_tips(resume_text, job_title, result['matched_skills'], result['missing_skills'])
-                    st.subheader("🤖 AI-Powered Resume Improvement Suggestions")
-                    st.write(resume_tips)
+            try:
+                analysis = resumerec.analyze_resume_for_job(uploaded_file, job_title)
+            except DocumentExtractionError as e:
+                st.error(str(e))
+                analysis = None
+
+        if analysis:
+            result = analysis.result
+
+            # Chatbot Response
+            st.subheader("🔍 Resume Analysis Report")
+            st.write(f"*Impact Strength Score:* {result['strength_score']}%")
+
+            # DeepSeek-Powered Resume Improvement Suggestions, shown as they are generated
+            st.subheader("🤖 AI-Powered Resume Improvement Suggestions")
+            st.write_stream(analysis.stream_tips())
 
     else:
         st.info("📤 Please upload a resume and enter a job title to proceed.")
\ No newline at end of file
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from cache import TTLCache, SqliteCache, TieredCache, SingleFlight, make_key
+
+class TestTTLCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_expiry(self):
+        """Test entries disappear after their TTL"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("short", 1, ttl=0.01)
+        cache.set("long", 2)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("long"), 2)
+
+class TestSqliteCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_persists_across_instances(self):
+        """Test values survive reopening the database"""
+        cache = SqliteCache(self.path, ttl=60)
+        cache.set("jobs", [{"Title": "Data Engineer"}])
+        cache.close()
+        self.assertEqual(SqliteCache(self.path).get("jobs"), [{"Title": "Data Engineer"}])
+
+    def test_size_bound_and_expiry(self):
+        """Test the table is capped and expired rows are not returned"""
+        cache = SqliteCache(self.path, max_entries=2)
+        for i in range(4):
+            cache.set(str(i), i)
+        self.assertEqual([cache.get(str(i)) for i in range(4)], [None, None, 2, 3])
+        cache.set("short", 1, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("short"))
+
+    def test_tiered_cache_promotes_disk_hits(self):
+        """Test a disk hit is copied into the memory tier"""
+        disk = SqliteCache(self.path, ttl=60)
+        disk.set("key", "value")
+        cache = TieredCache(TTLCache(maxsize=4), disk)
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(cache.memory.get("key"), "value")
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        """Test callers arriving mid-flight join the running call"""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return ["job"]
+
+        leader = threading.Thread(target=lambda: results.append(flight.do("key", fetch)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flight.do("key", fetch))) for _ in range(3)]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+        self.assertEqual(flight.do("key", lambda: ["again"]), (["again"], False))
+
+    def test_exceptions_propagate(self):
+        """Test a failing call raises for the caller"""
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+class TestMakeKey(unittest.TestCase):
+    def test_normalizes_case_and_whitespace(self):
+        """Test equivalent queries share a key"""
+        self.assertEqual(make_key("Data  Scientist ", "San Francisco", 1), make_key("data scientist", "san francisco", 1))
+        self.assertNotEqual(make_key("data scientist", "sf", 1), make_key("data scientist", "sf", 2))
+
+if __name__ == '__main__':
+    unittest.main()
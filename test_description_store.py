@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from description_store import DescriptionStore, normalize_job_url
+
+class TestNormalizeJobUrl(unittest.TestCase):
+    def test_linkedin_variants_share_a_key(self):
+        """Test host, subdomain, trailing slash, fragment and tracking parameters are ignored"""
+        expected = "https://linkedin.com/jobs/view/3791234567"
+        for url in (
+            "https://www.linkedin.com/jobs/view/3791234567/",
+            "HTTPS://de.linkedin.com/jobs/view/3791234567?trk=public_jobs&refId=abc&trackingId=x%3D%3D",
+            "https://linkedin.com/jobs/view/3791234567#apply",
+            "https://linkedin.com/jobs/view/3791234567?utm_source=mail&utm_campaign=spring",
+        ):
+            self.assertEqual(normalize_job_url(url), expected)
+
+    def test_identifying_parameters_kept(self):
+        """Test postings identified by a query parameter keep distinct keys"""
+        first = normalize_job_url("https://www.indeed.com/viewjob?jk=abc123&from=serp&tk=1h2")
+        second = normalize_job_url("https://www.indeed.com/viewjob?jk=def456")
+        self.assertEqual(first, "https://indeed.com/viewjob?jk=abc123")
+        self.assertNotEqual(first, second)
+        self.assertEqual(normalize_job_url("https://jobs.example.com/posting?b=2&a=1"),
+                         normalize_job_url("https://jobs.example.com/posting?a=1&b=2"))
+
+    def test_missing_links(self):
+        """Test missing links have no key"""
+        self.assertIsNone(normalize_job_url(None))
+        self.assertIsNone(normalize_job_url("N/A"))
+
+class TestDescriptionStore(unittest.TestCase):
+    def test_indeed_postings_stored_separately(self):
+        """Test descriptions of different Indeed postings do not overwrite each other"""
+        with tempfile.TemporaryDirectory() as directory:
+            store = DescriptionStore(os.path.join(directory, "descriptions.db"))
+            store.put_many([
+                ("https://www.indeed.com/rc/clk?jk=1", "First"),
+                ("https://www.indeed.com/rc/clk?jk=2", "Second"),
+            ])
+            self.assertEqual(store.get("https://indeed.com/rc/clk?jk=2&from=serp"), "Second")
+            self.assertEqual(store.get("https://www.indeed.com/rc/clk?jk=1"), "First")
+            store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import io
+import unittest
+from unittest import mock
+import document_extraction
+from document_extraction import DocumentExtractionError, extract_text, extract_text_from_upload
+
+def make_pdf(page_texts):
+    """Build a minimal PDF with one line of text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return pdf
+
+class TestDocumentExtraction(unittest.TestCase):
+    def test_pdf_pages_joined_in_order(self):
+        """Test every page is extracted and joined with line breaks"""
+        text = extract_text(make_pdf(["Python developer", "SQL and Docker"]), "resume.pdf")
+        self.assertEqual(text.split("\n"), ["Python developer", "SQL and Docker"])
+
+    def test_parallel_pdf_extraction_keeps_page_order(self):
+        """Test long PDFs are extracted across workers in page order"""
+        pages = [f"Page {i}" for i in range(12)]
+        with mock.patch.object(document_extraction, "PARALLEL_PAGE_THRESHOLD", 4), \
+                mock.patch.object(document_extraction, "EXTRACTION_WORKERS", 3):
+            text = extract_text(make_pdf(pages), "long.pdf")
+        self.assertEqual(text.split("\n"), pages)
+
+    def test_page_cap(self):
+        """Test pages past the cap are ignored"""
+        with mock.patch.object(document_extraction, "MAX_DOCUMENT_PAGES", 2):
+            text = document_extraction.extract_pdf_text(make_pdf(["One", "Two", "Three"]), max_pages=2)
+        self.assertEqual(text.split("\n"), ["One", "Two"])
+
+    def test_docx_and_txt(self):
+        """Test Word and plain-text documents"""
+        import docx
+        document = docx.Document()
+        document.add_paragraph("Data engineer")
+        document.add_paragraph("Spark and Airflow")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        self.assertEqual(extract_text(buffer.getvalue(), "resume.docx"), "Data engineer\nSpark and Airflow")
+        self.assertEqual(extract_text("  Café manager \n".encode("utf-8"), "resume.TXT"), "Café manager")
+
+    def test_results_cached_by_content(self):
+        """Test the same bytes are extracted once whatever the upload is called"""
+        data = make_pdf(["Cached resume"])
+        upload = io.BytesIO(data)
+        upload.name = "a.pdf"
+        with mock.patch.object(document_extraction, "extract_pdf_text", wraps=document_extraction.extract_pdf_text) as extract:
+            first = extract_text_from_upload(upload)
+            second = extract_text(data, "b.pdf")
+        self.assertEqual(first, second)
+        self.assertEqual(extract.call_count, 1)
+
+    def test_rejected_documents(self):
+        """Test unsupported, oversized and corrupt files raise DocumentExtractionError"""
+        with self.assertRaises(DocumentExtractionError):
+            extract_text(b"text", "resume.odt")
+        with mock.patch.object(document_extraction, "MAX_DOCUMENT_BYTES", 10):
+            with self.assertRaises(DocumentExtractionError):
+                extract_text(b"x" * 11, "resume.txt")
+        with self.assertRaises(DocumentExtractionError):
+            extract_text(b"not a pdf", "resume.pdf")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import idf_model
+from idf_model import IdfModel
+
+DOCUMENTS = [
+    "python developer with flask and sql",
+    "senior python engineer building data pipelines",
+    "registered nurse for the night shift",
+    "java developer with spring and sql",
+]
+
+class TestIdfModel(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model_dir = os.path.join(self.directory.name, "idf")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_partial_fit(self):
+        """Test documents are counted once and document frequencies add up"""
+        model = IdfModel(self.model_dir)
+        self.assertEqual(model.partial_fit(DOCUMENTS[:2]), 2)
+        self.assertEqual(model.partial_fit(DOCUMENTS[:3] + ["", DOCUMENTS[2]]), 1)
+        self.assertEqual(model.num_documents, 3)
+        python = model.vocabulary["python"]
+        nurse = model.vocabulary["nurse"]
+        self.assertEqual(int(model.document_frequency[python]), 2)
+        self.assertEqual(int(model.document_frequency[nurse]), 1)
+        # Rarer terms weigh more
+        self.assertGreater(model.idf[nurse], model.idf[python])
+
+    def test_round_trip(self):
+        """Test a saved model loads with the same statistics and remembers counted documents"""
+        model = IdfModel(self.model_dir)
+        model.partial_fit(DOCUMENTS)
+        model.save()
+
+        loaded = IdfModel.load(self.model_dir)
+        self.assertEqual(loaded.vocabulary, model.vocabulary)
+        self.assertEqual(loaded.model_id, model.model_id)
+        self.assertNotEqual(IdfModel(self.model_dir).model_id, model.model_id)
+        np.testing.assert_array_equal(loaded.document_frequency, model.document_frequency)
+        self.assertEqual(loaded.num_documents, 4)
+        self.assertEqual(loaded.partial_fit(DOCUMENTS[:2]), 0)
+        self.assertAlmostEqual(loaded.score(DOCUMENTS[0], [DOCUMENTS[0]])[0], 1.0, places=6)
+
+        # A loaded model keeps growing (its arrays are read-only maps) and saves again
+        self.assertEqual(loaded.partial_fit(["rust systems programmer"]), 1)
+        loaded.save()
+        self.assertEqual(IdfModel.load(self.model_dir).num_documents, 5)
+
+    def test_interrupted_save_keeps_previous_version(self):
+        """Test a save that dies before switching versions leaves the old model in use"""
+        model = IdfModel(self.model_dir)
+        model.partial_fit(DOCUMENTS)
+        model.save()
+        model.partial_fit(["rust systems programmer"])
+        with mock.patch.object(idf_model.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                model.save()
+        self.assertEqual(IdfModel.load(self.model_dir).num_documents, 4)
+
+    def test_unreadable_version_moved_aside(self):
+        """Test a broken saved model is moved aside rather than saved over"""
+        model = IdfModel(self.model_dir)
+        model.partial_fit(DOCUMENTS)
+        model.save()
+        with open(os.path.join(self.model_dir, idf_model.CURRENT_FILE)) as f:
+            version_dir = os.path.join(self.model_dir, f.read())
+        with open(os.path.join(version_dir, idf_model.VOCABULARY_FILE), "w") as f:
+            f.write("python\n")
+
+        empty = IdfModel.load(self.model_dir)
+        self.assertEqual(empty.num_documents, 0)
+        moved = [name for name in os.listdir(self.model_dir) if name.startswith("unreadable-")]
+        self.assertEqual(len(moved), 1)
+        with open(os.path.join(self.model_dir, moved[0], idf_model.META_FILE)) as f:
+            self.assertEqual(json.load(f)["num_documents"], 4)
+
+        empty.partial_fit(DOCUMENTS[:1])
+        empty.save()
+        self.assertEqual(IdfModel.load(self.model_dir).num_documents, 1)
+        self.assertTrue(os.path.exists(os.path.join(self.model_dir, moved[0], idf_model.META_FILE)))
+
+    def test_save_if_due(self):
+        """Test throttled saves skip unchanged models and recent saves, and old versions are pruned"""
+        model = IdfModel(self.model_dir)
+        self.assertFalse(model.save_if_due(0))
+        model.partial_fit(DOCUMENTS[:1])
+        self.assertTrue(model.save_if_due(60))
+        model.partial_fit(DOCUMENTS[1:2])
+        self.assertFalse(model.save_if_due(60))
+        self.assertTrue(model.save_if_due(0))
+        model.partial_fit(DOCUMENTS[2:3])
+        self.assertTrue(model.save_if_due(0))
+        versions = [name for name in os.listdir(self.model_dir) if name.startswith("v")]
+        self.assertEqual(len(versions), 2)
+        self.assertEqual(IdfModel.load(self.model_dir).num_documents, 3)
+
+if __name__ == '__main__':
+    unittest.main()
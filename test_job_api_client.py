@@ -0,0 +1,148 @@
+import json
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from job_api_client import JobSearchClient
+
+class StubJobSearchHandler(BaseHTTPRequestHandler):
+    """Stub RapidAPI endpoint that replays queued statuses"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(body)
+            server.client_ports.add(self.client_address[1])
+            status = server.statuses.pop(0) if server.statuses else 200
+        time.sleep(server.delay)
+        payload = json.dumps([{"job_title": "Data Engineer", "page": body["page"]}] if status == 200 else {"error": status}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestJobSearchClient(unittest.TestCase):
+    def setUp(self):
+        """Start a local stub server"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubJobSearchHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.client_ports = set()
+        self.server.statuses = []
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = JobSearchClient(
+            "127.0.0.1", api_key="fake-api-key", scheme="http", port=self.server.server_address[1],
+            max_connections=2, timeout=5, max_retries=2, backoff_base=0.01, backoff_max=0.05
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_successful_search(self):
+        """Test a search returns the decoded job list"""
+        status, jobs = self.client.search("data engineer", "San Francisco", page=2)
+        self.assertEqual(status, 200)
+        self.assertEqual(jobs, [{"job_title": "Data Engineer", "page": 2}])
+        self.assertEqual(self.server.requests[0]["search_terms"], "data engineer")
+
+    def test_connection_is_kept_alive(self):
+        """Test sequential searches reuse one socket"""
+        for page in range(1, 6):
+            self.client.search("data engineer", "San Francisco", page=page)
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_concurrent_searches_respect_connection_limit(self):
+        """Test concurrent searches never open more than max_connections sockets"""
+        threads = [threading.Thread(target=self.client.search, args=("data engineer", "NYC", page)) for page in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.server.requests), 10)
+        self.assertLessEqual(len(self.server.client_ports), 2)
+
+    def test_retries_rate_limit_and_server_errors(self):
+        """Test 429 and 5xx responses are retried"""
+        self.server.statuses = [429, 503]
+        status, jobs = self.client.search("data engineer", "San Francisco")
+        self.assertEqual(status, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_gives_up_after_max_retries(self):
+        """Test the last error status is returned once retries are exhausted"""
+        self.server.statuses = [500, 500, 500, 500]
+        status, jobs = self.client.search("data engineer", "San Francisco")
+        self.assertEqual(status, 500)
+        self.assertIsNone(jobs)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_client_error_is_not_retried(self):
+        """Test a 4xx other than 429 is returned immediately"""
+        self.server.statuses = [403]
+        status, jobs = self.client.search("data engineer", "San Francisco")
+        self.assertEqual(status, 403)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_read_timeout_not_retried(self):
+        """Test a request that times out waiting for the response is sent only once"""
+        self.client.close()
+        self.client = JobSearchClient(
+            "127.0.0.1", api_key="fake-api-key", scheme="http", port=self.server.server_address[1],
+            timeout=0.2, max_retries=2, backoff_base=0.01, backoff_max=0.05
+        )
+        self.server.delay = 0.5
+        with self.assertRaises(socket.timeout):
+            self.client.search("data engineer", "San Francisco")
+        time.sleep(0.5)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_closed_keep_alive_socket_retried(self):
+        """Test a pooled socket that was closed while idle is replaced and the request resent"""
+        self.client.search("data engineer", "San Francisco")
+        self.client._idle.queue[0].sock.shutdown(socket.SHUT_RDWR)
+        status, jobs = self.client.search("data engineer", "San Francisco", page=2)
+        self.assertEqual(status, 200)
+        self.assertEqual(jobs, [{"job_title": "Data Engineer", "page": 2}])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_connect_failure_retried(self):
+        """Test failed connects are retried, since nothing was sent"""
+        closed = socket.socket()
+        closed.bind(("127.0.0.1", 0))
+        closed_port = closed.getsockname()[1]
+        closed.close()
+        ports = [closed_port, closed_port]
+        original = self.client._new_connection
+
+        def new_connection():
+            connection = original()
+            if ports:
+                connection.port = ports.pop(0)
+            return connection
+
+        self.client._new_connection = new_connection
+        status, _ = self.client.search("data engineer", "San Francisco")
+        self.assertEqual(status, 200)
+        self.assertEqual(ports, [])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_closed_client_rejects_requests(self):
+        """Test explicit cleanup"""
+        self.client.search("data engineer", "San Francisco")
+        self.client.close()
+        with self.assertRaises(RuntimeError):
+            self.client.search("data engineer", "San Francisco")
+
+if __name__ == '__main__':
+    unittest.main()
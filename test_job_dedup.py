@@ -0,0 +1,93 @@
+import unittest
+from job_dedup import JobDeduplicator, MinHasher, deduplicate_jobs, estimate_jaccard, posting_key
+from job_records import JobBatch
+
+DESCRIPTION = (
+    "We are hiring a senior data engineer to design and build batch and streaming pipelines "
+    "with Python, Spark and Airflow on AWS. You will own our data warehouse, work closely with "
+    "analysts and product teams, and mentor junior engineers. Experience with SQL, Kafka and "
+    "dbt is a plus. We offer remote work, a learning budget and flexible hours."
+)
+REPOST = DESCRIPTION.replace("We offer remote work", "Apply today! We offer fully remote work")
+OTHER_DESCRIPTION = (
+    "Our clinic is looking for a registered nurse to join the night shift team. Responsibilities "
+    "include patient assessment, administering medication, keeping accurate records and supporting "
+    "physicians during procedures. A valid nursing license and two years of experience are required."
+)
+
+def make_job(title, company, link, description=""):
+    return {"Title": title, "Company": company, "Location": "Remote", "Link": link, "Description": description}
+
+class TestJobDedup(unittest.TestCase):
+    def test_posting_key(self):
+        """Test URLs resolve to job IDs where the site has them"""
+        self.assertEqual(posting_key("https://de.linkedin.com/jobs/view/data-engineer-at-acme-3791234567?trk=x"),
+                         "linkedin:3791234567")
+        self.assertEqual(posting_key("https://www.linkedin.com/jobs/view/3791234567/"), "linkedin:3791234567")
+        self.assertEqual(posting_key("https://www.indeed.com/rc/clk?jk=abc123&from=serp"), "indeed:abc123")
+        self.assertNotEqual(posting_key("https://www.indeed.com/rc/clk?jk=abc123"),
+                            posting_key("https://www.indeed.com/rc/clk?jk=def456"))
+        self.assertIsNone(posting_key("N/A"))
+
+    def test_minhash_estimates_similarity(self):
+        """Test signatures of a repost agree far more than those of unrelated text"""
+        hasher = MinHasher()
+        original = hasher.signature(DESCRIPTION)
+        self.assertGreater(estimate_jaccard(original, hasher.signature(REPOST)), 0.8)
+        self.assertLess(estimate_jaccard(original, hasher.signature(OTHER_DESCRIPTION)), 0.2)
+        self.assertIsNone(hasher.signature("No description available"))
+
+    def test_near_duplicates_merged(self):
+        """Test reposts under another title and link collapse into the first posting"""
+        jobs = [
+            make_job("Senior Data Engineer", "Acme", "https://www.linkedin.com/jobs/view/1", DESCRIPTION),
+            make_job("Sr. Data Engineer (Remote)", "Acme Inc", "https://www.linkedin.com/jobs/view/2", REPOST),
+            make_job("Night Nurse", "Clinic", "https://www.linkedin.com/jobs/view/3", OTHER_DESCRIPTION),
+            make_job("Night Nurse", "Clinic", "https://linkedin.com/jobs/view/3?trk=abc"),
+        ]
+        kept = deduplicate_jobs(jobs)
+        self.assertEqual([job["Title"] for job in kept], ["Senior Data Engineer", "Night Nurse"])
+        self.assertEqual(kept[0]["Other Links"], ["https://www.linkedin.com/jobs/view/2"])
+        self.assertEqual(kept[1]["Other Links"], ["https://linkedin.com/jobs/view/3?trk=abc"])
+
+    def test_listing_key_only_for_indeed(self):
+        """Test same-listing postings merge on Indeed but not on LinkedIn or across sources"""
+        kept = deduplicate_jobs([
+            make_job("Data Engineer", "Acme", "https://www.indeed.com/rc/clk?jk=1"),
+            make_job("data  engineer", "ACME", "https://www.indeed.com/rc/clk?jk=2"),
+            make_job("Data Engineer", "Acme", "https://www.linkedin.com/jobs/view/3"),
+            make_job("Data Engineer", "Acme", "https://www.linkedin.com/jobs/view/4"),
+        ])
+        self.assertEqual([job["Link"] for job in kept], [
+            "https://www.indeed.com/rc/clk?jk=1",
+            "https://www.linkedin.com/jobs/view/3",
+            "https://www.linkedin.com/jobs/view/4",
+        ])
+        self.assertEqual(kept[0]["Other Links"], ["https://www.indeed.com/rc/clk?jk=2"])
+
+    def test_missing_description_taken_from_duplicate(self):
+        """Test a canonical posting without a description takes its duplicate's"""
+        kept = deduplicate_jobs([
+            make_job("Data Engineer", "Acme", "https://www.linkedin.com/jobs/view/1"),
+            make_job("Data Engineer", "Acme", "https://www.linkedin.com/jobs/view/1", DESCRIPTION),
+        ])
+        self.assertEqual(len(kept), 1)
+        self.assertEqual(kept[0]["Description"], DESCRIPTION)
+        self.assertNotIn("Other Links", kept[0])
+
+    def test_batches_deduplicated_across_pages(self):
+        """Test later batches drop rows seen earlier and add their links to the earlier row"""
+        deduplicator = JobDeduplicator()
+        first = JobBatch.from_dicts([
+            make_job("Senior Data Engineer", "Acme", "https://www.linkedin.com/jobs/view/1", DESCRIPTION)
+        ]).drop_duplicates(deduplicator)
+        second = JobBatch.from_dicts([
+            make_job("Data Engineer", "Acme", "https://www.indeed.com/viewjob?jk=9f", REPOST),
+            make_job("Night Nurse", "Clinic", "https://www.linkedin.com/jobs/view/3", OTHER_DESCRIPTION),
+        ]).drop_duplicates(deduplicator)
+        self.assertEqual(second.titles, ["Night Nurse"])
+        merged = JobBatch.concat([first, second]).to_dicts()
+        self.assertEqual(merged[0]["Other Links"], ["https://www.indeed.com/viewjob?jk=9f"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+from unittest import mock
+import job_fetch
+from job_fetch import fetch_jobs, iter_job_pages
+
+class StubSource:
+    """Page function recording its calls; pages listed in `slow` block until released"""
+    def __init__(self, failing=(), slow=()):
+        self.failing = failing
+        self.slow = slow
+        self.release = threading.Event()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, job_title, location, page, deadline=None):
+        with self.lock:
+            self.calls.append((page, deadline))
+        if page in self.slow:
+            self.release.wait(timeout=30)
+        if page in self.failing:
+            raise RuntimeError("blocked by the site")
+        return [{"Title": f"{job_title} {page}", "Location": location}]
+
+class TestIterJobPages(unittest.TestCase):
+    def use_sources(self, workers=10, **sources):
+        patchers = [mock.patch.dict(job_fetch.SOURCES, sources, clear=True),
+                    mock.patch.object(job_fetch, "SEARCH_FETCH_WORKERS", workers)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for source in sources.values():
+            self.addCleanup(source.release.set)
+
+    def test_every_page_of_every_source(self):
+        """Test each page of each source is fetched once, under a shared deadline"""
+        indeed, linkedin = StubSource(), StubSource()
+        self.use_sources(indeed=indeed, linkedin=linkedin)
+        started = time.monotonic()
+        results = list(iter_job_pages("Nurse", "Boston", 2, ("indeed", "linkedin"), timeout=30))
+        self.assertEqual(sorted((source, page) for source, page, _ in results),
+                         [("indeed", 1), ("indeed", 2), ("linkedin", 1), ("linkedin", 2)])
+        self.assertEqual(sorted(page for page, _ in indeed.calls), [1, 2])
+        for _, deadline in indeed.calls + linkedin.calls:
+            self.assertAlmostEqual(deadline, started + 30, delta=1)
+
+    def test_failing_page_yields_no_jobs(self):
+        """Test a page that raises is reported with no jobs and the other pages still arrive"""
+        self.use_sources(indeed=StubSource(failing=(2,)))
+        results = {page: jobs for _, page, jobs in iter_job_pages("Nurse", "Boston", 3, ("indeed",), timeout=30)}
+        self.assertEqual(results[2], [])
+        self.assertEqual(results[1], [{"Title": "Nurse 1", "Location": "Boston"}])
+        self.assertEqual(len(results[3]), 1)
+
+    def test_timeout_cancels_pending_pages(self):
+        """Test the search stops at its timeout and pages not yet started are never fetched"""
+        indeed = StubSource(slow=(1,))
+        self.use_sources(workers=1, indeed=indeed)
+        started = time.monotonic()
+        results = list(iter_job_pages("Nurse", "Boston", 3, ("indeed",), timeout=0.2))
+        self.assertEqual(results, [])
+        self.assertLess(time.monotonic() - started, 5)
+
+        indeed.release.set()
+        time.sleep(0.2)
+        self.assertEqual([page for page, _ in indeed.calls], [1])
+
+    def test_stopping_early_cancels_pending_pages(self):
+        """Test a caller that stops iterating does not leave the remaining pages queued"""
+        indeed = StubSource(slow=(2,))
+        self.use_sources(workers=1, indeed=indeed)
+        pages = iter_job_pages("Nurse", "Boston", 5, ("indeed",), timeout=30)
+        self.assertEqual(next(pages)[1], 1)
+        pages.close()
+        indeed.release.set()
+        time.sleep(0.2)
+        # Page 2 may or may not have started when the caller stopped; pages 3 to 5 never do
+        self.assertIn([page for page, _ in indeed.calls], ([1], [1, 2]))
+
+    def test_fetch_jobs_merges_pages(self):
+        """Test fetch_jobs returns the jobs of every page, with no pages for no sources"""
+        self.use_sources(indeed=StubSource())
+        self.assertEqual(len(fetch_jobs("Nurse", "Boston", 3, ("indeed",), timeout=30)), 3)
+        self.assertEqual(fetch_jobs("Nurse", "Boston", 3, (), timeout=30), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import math
+import unittest
+from job_records import JobBatch, JobRecord
+
+def make_job(title, company="Acme", location="Remote", description="Python developer"):
+    return {"Title": title, "Company": company, "Location": location,
+            "Link": f"https://example.com/{title.replace(' ', '-')}", "Description": description}
+
+class TestJobRecords(unittest.TestCase):
+    def test_dict_round_trip(self):
+        """Test jobs survive conversion to a batch and back, without a score until scored"""
+        jobs = [make_job("Data Engineer"), make_job("ML Engineer", company="Globex", location="Berlin")]
+        batch = JobBatch.from_dicts(jobs)
+        self.assertEqual(batch.to_dicts(), jobs)
+        self.assertEqual(batch.companies, ["Acme", "Globex"])
+        self.assertEqual(batch.company_codes.tolist(), [0, 1])
+
+        batch.set_scores([0.5, 0.25])
+        self.assertEqual([job["Similarity Score"] for job in batch.to_dicts()], [0.5, 0.25])
+
+    def test_record_slots(self):
+        """Test records have fixed attributes"""
+        record = JobRecord.from_dict(make_job("Analyst"))
+        with self.assertRaises(AttributeError):
+            record.salary = 100
+        self.assertEqual(record.to_dict(), make_job("Analyst"))
+
+    def test_concat_remaps_codes(self):
+        """Test concatenated batches share one dictionary per column"""
+        first = JobBatch.from_dicts([make_job("A", company="Acme"), make_job("B", company="Globex")])
+        second = JobBatch.from_dicts([make_job("C", company="Globex"), make_job("D", company="Initech")])
+        batch = JobBatch.concat([first, second])
+        self.assertEqual(batch.companies, ["Acme", "Globex", "Initech"])
+        self.assertEqual(batch.to_columns()["Company"], ["Acme", "Globex", "Globex", "Initech"])
+        self.assertEqual(len(JobBatch.concat([])), 0)
+
+    def test_ranked(self):
+        """Test ranking is by score, stable for ties, unscored rows last, and honours top_k"""
+        batch = JobBatch.from_dicts([make_job(title) for title in "ABCD"])
+        batch.set_scores([0.2, math.nan, 0.9, 0.2])
+        self.assertEqual(batch.ranked().titles, ["C", "A", "D", "B"])
+        self.assertEqual(batch.ranked(top_k=2).titles, ["C", "A"])
+        self.assertIsNone(batch.ranked().to_dicts()[-1].get("Similarity Score"))
+
+    def test_drop_duplicates(self):
+        """Test Indeed (title, company, location) duplicates are merged, ignoring title case and spacing"""
+        jobs = [
+            make_job("Data Engineer"), make_job("data  engineer"),
+            make_job("Data Engineer", location="Berlin"), make_job("Data Engineer", company="Globex"),
+        ]
+        for i, job in enumerate(jobs):
+            job["Link"] = f"https://www.indeed.com/rc/clk?jk={i}"
+        deduped = JobBatch.from_dicts(jobs).drop_duplicates()
+        self.assertEqual(len(deduped), 3)
+        self.assertEqual(deduped.to_columns()["Location"], ["Remote", "Berlin", "Remote"])
+        self.assertEqual(deduped.to_dicts()[0]["Other Links"], ["https://www.indeed.com/rc/clk?jk=1"])
+        self.assertNotIn("Other Links", deduped.to_dicts()[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+from collections import Counter
+from unittest import mock
+import job_search
+from job_search import DESCRIPTION_PLACEHOLDER, fetch_descriptions
+
+def make_job(link, description=""):
+    return {"Title": "Data Engineer", "Company": "Acme", "Location": "Remote", "Link": link, "Description": description}
+
+class ConcurrencyTracker:
+    """Fetcher that sleeps briefly and records the peak number of concurrent fetches per host"""
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = Counter()
+        self.peak = Counter()
+        self.peak_total = 0
+
+    def __call__(self, url, lease_timeout):
+        host = url.split("/")[2]
+        with self.lock:
+            self.running[host] += 1
+            self.peak[host] = max(self.peak[host], self.running[host])
+            self.peak_total = max(self.peak_total, sum(self.running.values()))
+        time.sleep(self.delay)
+        with self.lock:
+            self.running[host] -= 1
+        return f"Description of {url}"
+
+class TestFetchDescriptions(unittest.TestCase):
+    def setUp(self):
+        # Per-host semaphores live for the whole process; start each test without any
+        patcher = mock.patch.object(job_search, "_host_limits", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_missing_descriptions_filled(self):
+        """Test only postings without a description are fetched, and failures get the placeholder"""
+        def fetcher(url, lease_timeout):
+            if url.endswith("/2"):
+                return None
+            if url.endswith("/3"):
+                raise RuntimeError("browser crashed")
+            return f"Description of {url}"
+
+        jobs = [
+            make_job("https://fill.test/jobs/1"), make_job("https://fill.test/jobs/2"),
+            make_job("https://fill.test/jobs/3"), make_job("https://fill.test/jobs/4", "Already known"),
+            make_job("N/A"),
+        ]
+        with mock.patch.object(job_search, "fetch_linkedin_description", side_effect=AssertionError("browser used")):
+            fetch_descriptions(jobs, fetcher=fetcher, deadline=time.monotonic() + 10, use_store=False)
+        self.assertEqual([job["Description"] for job in jobs], [
+            "Description of https://fill.test/jobs/1", DESCRIPTION_PLACEHOLDER, DESCRIPTION_PLACEHOLDER,
+            "Already known", "",
+        ])
+
+    def test_deadline_cuts_off_slow_fetches(self):
+        """Test the stage returns at the deadline, leaving slow postings with the placeholder"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fetcher(url, lease_timeout):
+            if "slow" in url:
+                release.wait(timeout=30)
+            return f"Description of {url}"
+
+        jobs = [make_job("https://deadline.test/fast"), make_job("https://deadline.test/slow")]
+        started = time.monotonic()
+        fetch_descriptions(jobs, fetcher=fetcher, max_workers=2, deadline=started + 0.3, use_store=False)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(jobs[0]["Description"], "Description of https://deadline.test/fast")
+        self.assertEqual(jobs[1]["Description"], DESCRIPTION_PLACEHOLDER)
+
+    def test_past_deadline_fetches_nothing(self):
+        """Test postings are not fetched at all once the deadline has passed"""
+        fetcher = mock.Mock(return_value="Description")
+        jobs = [make_job("https://late.test/jobs/1")]
+        fetch_descriptions(jobs, fetcher=fetcher, deadline=time.monotonic() - 1, use_store=False)
+        fetcher.assert_not_called()
+        self.assertEqual(jobs[0]["Description"], DESCRIPTION_PLACEHOLDER)
+
+    def test_per_host_limit(self):
+        """Test each host gets at most per_host_limit concurrent fetches while other hosts proceed"""
+        fetcher = ConcurrencyTracker()
+        jobs = ([make_job(f"https://a.test/jobs/{i}") for i in range(8)]
+                + [make_job(f"https://b.test/jobs/{i}") for i in range(8)])
+        fetch_descriptions(jobs, fetcher=fetcher, max_workers=16, per_host_limit=2,
+                           deadline=time.monotonic() + 30, use_store=False)
+        self.assertEqual(fetcher.peak["a.test"], 2)
+        self.assertEqual(fetcher.peak["b.test"], 2)
+        self.assertEqual(fetcher.peak_total, 4)
+        self.assertNotIn(DESCRIPTION_PLACEHOLDER, [job["Description"] for job in jobs])
+
+    def test_per_host_limit_across_calls(self):
+        """Test concurrent calls share one per-host limit"""
+        fetcher = ConcurrencyTracker()
+        threads = [
+            threading.Thread(target=fetch_descriptions, args=([make_job(f"https://shared.test/{n}/{i}") for i in range(4)],),
+                             kwargs={"fetcher": fetcher, "max_workers": 4, "per_host_limit": 2,
+                                     "deadline": time.monotonic() + 30, "use_store": False})
+            for n in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(fetcher.peak["shared.test"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
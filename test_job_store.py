@@ -0,0 +1,190 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from scipy import sparse
+import job_store
+from idf_model import IdfModel
+from job_store import JobIndex, JobStore, top_k_blocked
+
+def make_job(job_id, title, description, location="Boston, MA", host="linkedin"):
+    link = (f"https://www.indeed.com/rc/clk?jk={job_id}" if host == "indeed"
+            else f"https://www.linkedin.com/jobs/view/{job_id}")
+    return {"Title": title, "Company": "Acme", "Location": location, "Link": link, "Description": description}
+
+NURSE = "registered nurse patient care in a busy hospital ward"
+ENGINEER = "python spark airflow data pipelines and warehouse design"
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.directory.name, "jobs.db"))
+
+    def tearDown(self):
+        self.store._connection.close()
+        self.directory.cleanup()
+
+    def test_add_jobs(self):
+        """Test postings are stored once each, and only with a description"""
+        jobs = [make_job(i, "Nurse", NURSE, host="indeed") for i in range(3)]
+        self.assertEqual(self.store.add_jobs(jobs + [make_job(9, "Nurse", "")]), 3)
+        self.assertEqual(self.store.add_jobs([make_job(1, "Nurse", NURSE, host="indeed")]), 0)
+        self.assertEqual(self.store.count(), 3)
+
+        found = self.store.get_jobs_by_id([1, 2, 99])
+        self.assertEqual(sorted(found), [1, 2])
+        self.assertEqual(found[1]["Link"], "https://www.indeed.com/rc/clk?jk=0")
+        self.assertEqual([job_id for job_id, _ in self.store.iter_descriptions_after(1, batch_size=1)], [2, 3])
+
+    def test_ids_matching(self):
+        """Test title words and location are matched case-insensitively"""
+        self.store.add_jobs([
+            make_job(1, "Registered Nurse", NURSE),
+            make_job(2, "Senior Data Engineer", ENGINEER),
+            make_job(3, "Nurse Practitioner", NURSE, location="Denver, CO"),
+        ])
+        self.assertEqual(self.store.ids_matching("nurse", "boston").tolist(), [1])
+        self.assertEqual(self.store.ids_matching("NURSE").tolist(), [1, 3])
+        self.assertEqual(self.store.ids_matching("data engineer", "").tolist(), [2])
+        self.assertEqual(self.store.ids_matching("100%_").tolist(), [])
+        self.assertEqual(len(self.store.ids_matching()), 3)
+
+class TestTopKBlocked(unittest.TestCase):
+    def test_matches_full_sort(self):
+        """Test blocked search returns the same rows as sorting every score"""
+        generator = np.random.RandomState(0)
+        matrix = generator.rand(50, 8).astype(np.float32)
+        query = generator.rand(8).astype(np.float32)
+        expected = np.argsort(-(matrix @ query))[:7]
+        for block_size in (3, 7, 64):
+            rows, scores = top_k_blocked(matrix, query, 7, block_size=block_size)
+            self.assertEqual(rows.tolist(), expected.tolist())
+            self.assertTrue(np.all(np.diff(scores) <= 0))
+        rows, _ = top_k_blocked(sparse.csr_matrix(matrix), query, 7, block_size=5)
+        self.assertEqual(rows.tolist(), expected.tolist())
+
+    def test_top_k_larger_than_matrix(self):
+        """Test asking for more rows than exist returns them all"""
+        rows, _ = top_k_blocked(np.eye(3, dtype=np.float32), np.array([0.1, 0.3, 0.2], dtype=np.float32), 10, block_size=2)
+        self.assertEqual(rows.tolist(), [1, 2, 0])
+
+class TestJobIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.directory.name, "jobs.db"))
+        self.idf_model = IdfModel(os.path.join(self.directory.name, "idf"))
+        patcher = mock.patch("idf_model.get_idf_model", return_value=self.idf_model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.store._connection.close()
+        self.directory.cleanup()
+
+    def add(self, jobs):
+        self.idf_model.partial_fit([job["Description"] for job in jobs])
+        self.store.add_jobs(jobs)
+
+    def test_refresh_widens_and_searches(self):
+        """Test refresh appends new postings, widening rows built with a smaller vocabulary"""
+        index = JobIndex(self.store)
+        self.add([make_job(i, "Registered Nurse", NURSE + f" shift {i}") for i in range(10)])
+        self.assertEqual(index.refresh(), 10)
+        self.assertEqual(index.refresh(), 0)
+        width = index._matrix.shape[1]
+
+        self.add([make_job(20, "Data Engineer", ENGINEER)])
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual(len(index), 11)
+        self.assertGreater(index._matrix.shape[1], width)
+
+        jobs = index.search("spark airflow pipelines engineer resume", 3)
+        self.assertEqual(jobs[0]["Title"], "Data Engineer")
+        self.assertEqual([job["Title"] for job in index.search("spark airflow pipelines", 3, job_title="nurse")],
+                         ["Registered Nurse"] * 3)
+        self.assertEqual(index.search("spark airflow pipelines", 3, job_title="pilot"), [])
+
+    def test_rebuild_after_idf_drift(self):
+        """Test the TF-IDF index is rebuilt once the IDF model has grown by 10%"""
+        index = JobIndex(self.store)
+        self.add([make_job(i, "Nurse", NURSE + f" ward {i}") for i in range(10)])
+        index.refresh()
+        self.idf_model.partial_fit([ENGINEER + f" team {i}" for i in range(2)])
+        self.add([make_job(30, "Data Engineer", ENGINEER)])
+        self.assertEqual(index.refresh(), 11)
+        self.assertEqual(index._built_with_documents, self.idf_model.num_documents)
+
+    def test_saved_index_loaded(self):
+        """Test a new index picks up the saved one instead of embedding the store again"""
+        path = os.path.join(self.directory.name, "index")
+        self.add([make_job(i, "Nurse", NURSE + f" unit {i}") for i in range(5)])
+        JobIndex(self.store, path=path).refresh()
+
+        reloaded = JobIndex(self.store, path=path)
+        with mock.patch.object(JobIndex, "_embed", side_effect=AssertionError("embedded again")):
+            self.assertTrue(reloaded.load())
+            self.assertEqual(reloaded.refresh(), 0)
+        self.assertEqual(len(reloaded), 5)
+        self.assertEqual(len(reloaded.search("hospital ward nurse", 2)), 2)
+
+    def test_saved_index_ignored_after_idf_reset(self):
+        """Test an index saved with an IDF model that has since been started over is rebuilt"""
+        path = os.path.join(self.directory.name, "index")
+        self.add([make_job(1, "Data Engineer", ENGINEER), make_job(2, "Nurse", NURSE)])
+        JobIndex(self.store, path=path).refresh()
+
+        self.idf_model = IdfModel(os.path.join(self.directory.name, "idf"))
+        self.idf_model.partial_fit([NURSE, "java spring developer"])
+        with mock.patch("idf_model.get_idf_model", return_value=self.idf_model):
+            reloaded = JobIndex(self.store, path=path)
+            self.assertFalse(reloaded.load())
+            self.assertEqual(reloaded.refresh(), 2)
+            self.assertEqual(reloaded._stamp, self.idf_model.model_id)
+
+    def test_rebuild_when_idf_model_shrinks(self):
+        """Test the TF-IDF index is rebuilt when the IDF model has fewer documents than it was built with"""
+        index = JobIndex(self.store)
+        self.add([make_job(i, "Nurse", NURSE + f" bay {i}") for i in range(4)])
+        index.refresh()
+        index._built_with_documents = 100
+        self.assertEqual(index.refresh(), 4)
+        self.assertEqual(index._built_with_documents, self.idf_model.num_documents)
+
+    def test_refresh_async(self):
+        """Test a background refresh publishes the new postings"""
+        index = JobIndex(self.store)
+        self.add([make_job(i, "Nurse", NURSE + f" floor {i}") for i in range(4)])
+        self.assertTrue(index.refresh_async())
+        index._refresh_thread.join(timeout=30)
+        self.assertEqual(len(index), 4)
+
+    @unittest.skipIf(job_store._import_hnswlib() is None, "hnswlib is not installed")
+    def test_hnsw_extended_in_place(self):
+        """Test refresh adds rows to the existing HNSW graph instead of rebuilding it"""
+        vectors = {}
+
+        def embed(index, texts):
+            rows = []
+            for text in texts:
+                generator = np.random.RandomState(len(vectors))
+                vectors[text] = generator.rand(8).astype(np.float32)
+                rows.append(vectors[text])
+            return np.vstack(rows)
+
+        with mock.patch.object(job_store, "HNSW_MIN_SIZE", 5), \
+                mock.patch.object(JobIndex, "_embed", embed), \
+                mock.patch.object(JobIndex, "_model_stamp", return_value=""):
+            index = JobIndex(self.store, mode="doc2vec")
+            self.store.add_jobs([make_job(i, "Nurse", f"posting {i}") for i in range(6)])
+            index.refresh()
+            graph = index._hnsw
+            self.assertEqual(graph.get_current_count(), 6)
+
+            self.store.add_jobs([make_job(i, "Nurse", f"posting {i}") for i in range(6, 9)])
+            index.refresh()
+            self.assertIs(index._hnsw, graph)
+            self.assertEqual(graph.get_current_count(), 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from cache import SqliteCache, TTLCache, TieredCache
+from llm_client import ChatClient
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """Stub chat completions endpoint that echoes the prompt"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("Authorization"), body))
+            status = server.statuses.pop(0) if server.statuses else 200
+        time.sleep(server.delay)
+        prompt = body["messages"][0]["content"]
+        if status == 200 and body.get("stream"):
+            # Server-sent events, one word per chunk
+            words = f"reply to {prompt.strip()}".split(" ")
+            chunks = [words[0]] + [" " + word for word in words[1:]]
+            events = [json.dumps({"choices": [{"delta": {"content": chunk}}]}) for chunk in chunks] + ["[DONE]"]
+            payload = "".join(f"data: {event}\n\n" for event in events).encode("utf-8")
+            content_type = "text/event-stream"
+        else:
+            reply = {"choices": [{"message": {"content": f"reply to {prompt.strip()}"}}]} if status == 200 else {"error": status}
+            payload = json.dumps(reply).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestChatClient(unittest.TestCase):
+    def setUp(self):
+        """Start a local stub server and a client with a memory and disk cache"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubChatHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.statuses = []
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tempdir.name, "llm_cache.db")
+        self.client = self.make_client()
+
+    def make_client(self):
+        cache = TieredCache(TTLCache(maxsize=16), SqliteCache(self.db_path, ttl=60))
+        return ChatClient(
+            base_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1", api_key="fake-api-key",
+            cache=cache, timeout=(1, 5), max_retries=2, backoff_factor=0.01
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tempdir.cleanup()
+
+    def test_completion(self):
+        """Test a reply is returned and the request is well formed"""
+        self.assertEqual(self.client.complete("List skills", temperature=0), "reply to List skills")
+        path, authorization, body = self.server.requests[0]
+        self.assertEqual(path, "/v1/chat/completions")
+        self.assertEqual(authorization, "Bearer fake-api-key")
+        self.assertEqual(body["temperature"], 0)
+
+    def test_repeat_prompt_is_cached(self):
+        """Test prompts differing only in whitespace share one request"""
+        self.client.complete("List  skills\n for a role")
+        reply = self.client.complete("List skills for a role")
+        self.assertEqual(reply, "reply to List  skills\n for a role")
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_cache_survives_restart(self):
+        """Test a new client reuses replies from the SQLite cache"""
+        self.client.complete("List skills")
+        self.client.close()
+        self.client = self.make_client()
+        self.assertEqual(self.client.complete("List skills"), "reply to List skills")
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_cache_does_not_store_prompt(self):
+        """Test the SQLite cache is keyed by a hash, not the prompt text"""
+        self.client.complete("Resume of Jane Doe, jane@example.com")
+        connection = sqlite3.connect(self.db_path)
+        keys = [key for key, in connection.execute("SELECT key FROM cache")]
+        connection.close()
+        self.assertEqual(len(keys), 1)
+        self.assertNotIn("jane", keys[0])
+
+    def test_concurrent_identical_prompts_share_request(self):
+        """Test concurrent calls for the same prompt send one request"""
+        self.server.delay = 0.2
+        replies = []
+        threads = [threading.Thread(target=lambda: replies.append(self.client.complete("List skills"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(replies, ["reply to List skills"] * 5)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_retries_and_failures_are_not_cached(self):
+        """Test 5xx responses are retried and a final failure is not cached"""
+        self.server.statuses = [503]
+        self.assertEqual(self.client.complete("List skills"), "reply to List skills")
+        self.assertEqual(len(self.server.requests), 2)
+
+        self.server.statuses = [500, 500, 500]
+        self.assertIsNone(self.client.complete("Other prompt"))
+        self.assertEqual(self.client.complete("Other prompt"), "reply to Other prompt")
+
+    def test_read_timeout_not_retried(self):
+        """Test a request that times out waiting for the reply is sent only once"""
+        self.client.close()
+        self.client = ChatClient(
+            base_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1",
+            timeout=(1, 0.2), max_retries=2, backoff_factor=0.01
+        )
+        self.server.delay = 0.5
+        self.assertIsNone(self.client.complete("List skills"))
+        time.sleep(0.5)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stream_yields_pieces_and_caches_reply(self):
+        """Test a streamed reply arrives in pieces and is then served from the cache"""
+        pieces = list(self.client.stream("List skills"))
+        self.assertEqual(pieces, ["reply", " to", " List", " skills"])
+        self.assertTrue(self.server.requests[0][2]["stream"])
+        self.assertEqual(self.client.complete("List skills"), "reply to List skills")
+        self.assertEqual(list(self.client.stream("List skills")), ["reply to List skills"])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_failed_stream_yields_nothing(self):
+        """Test a client error ends the stream without output"""
+        self.server.statuses = [400]
+        self.assertEqual(list(self.client.stream("List skills")), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from search_queue import SearchHandle, SearchQueue, SearchQueueFull
+
+class BlockingSearch:
+    """Search body that holds each worker until released"""
+    def __init__(self):
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    def __call__(self, handle):
+        self.started.release()
+        self.release.wait(timeout=30)
+        return [handle.params]
+
+class TestSearchQueue(unittest.TestCase):
+    def test_full_queue_rejects(self):
+        """Test submit raises once max_pending searches are waiting, and accepts again once they start"""
+        search = BlockingSearch()
+        searches = SearchQueue(search, workers=1, max_pending=1)
+        searches.submit("running")
+        self.assertTrue(search.started.acquire(timeout=10))
+        waiting = searches.submit("waiting")
+        with self.assertRaises(SearchQueueFull):
+            searches.submit("rejected")
+        self.assertEqual(searches.pending_count(), 1)
+
+        search.release.set()
+        self.assertTrue(searches.shutdown(timeout=10))
+        self.assertEqual(searches.get(waiting).results, ["waiting"])
+
+    def test_full_queue_responds_429(self):
+        """Test the submit endpoint answers 429 with Retry-After when the queue is full"""
+        import app
+        search = BlockingSearch()
+        searches = SearchQueue(search, workers=1, max_pending=1)
+        payload = {"resume": "Python developer", "job_title": "Data Engineer"}
+        with mock.patch.object(app, "search_queue", searches):
+            client = app.app.test_client()
+            self.assertEqual(client.post("/searches", json=payload).status_code, 202)
+            self.assertTrue(search.started.acquire(timeout=10))
+            self.assertEqual(client.post("/searches", json=payload).status_code, 202)
+            response = client.post("/searches", json=payload)
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers["Retry-After"], "5")
+        search.release.set()
+        self.assertTrue(searches.shutdown(timeout=10))
+
+    def test_finished_searches_purged(self):
+        """Test finished searches are dropped once the retention period has passed"""
+        searches = SearchQueue(lambda handle: [], workers=1, retention=60)
+        search_id = searches.submit("old")
+        self.assertTrue(searches.shutdown(timeout=10))
+        self.assertEqual(searches.get(search_id).status, "done")
+
+        searches._closed = False
+        searches.get(search_id).finished_at = time.time() - 120
+        recent_id = searches.submit("new")
+        self.assertIsNone(searches.get(search_id))
+        self.assertIsNotNone(searches.get(recent_id))
+        searches.shutdown(timeout=10)
+
+    def test_failed_search_reported(self):
+        """Test an exception in the search body marks the search failed"""
+        def fail(handle):
+            raise RuntimeError("scraper down")
+        searches = SearchQueue(fail, workers=1)
+        search_id = searches.submit("broken")
+        self.assertTrue(searches.shutdown(timeout=10))
+        handle = searches.get(search_id)
+        self.assertEqual(handle.status, "failed")
+        self.assertIn("scraper down", handle.error)
+
+    def test_shutdown(self):
+        """Test shutdown refuses new searches and times out while one is still running"""
+        search = BlockingSearch()
+        searches = SearchQueue(search, workers=1)
+        search_id = searches.submit("running")
+        self.assertTrue(search.started.acquire(timeout=10))
+        self.assertFalse(searches.shutdown(timeout=0.1))
+        with self.assertRaises(SearchQueueFull):
+            searches.submit("late")
+
+        search.release.set()
+        self.assertTrue(searches.shutdown(timeout=10))
+        self.assertEqual(searches.get(search_id).status, "done")
+
+class TestSearchHandle(unittest.TestCase):
+    def test_wait_for_change(self):
+        """Test waiting returns on new partial results and times out when nothing changes"""
+        handle = SearchHandle("id", {})
+        version = handle.version
+        started = time.monotonic()
+        handle.wait_for_change(version, timeout=0.1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+        timer = threading.Timer(0.05, handle.add_partial_results, [[{"Title": "A"}]])
+        timer.start()
+        started = time.monotonic()
+        handle.wait_for_change(version, timeout=10)
+        timer.join()
+        self.assertLess(time.monotonic() - started, 5)
+        snapshot = handle.snapshot()
+        self.assertGreater(snapshot["version"], version)
+        self.assertEqual(snapshot["partial_results"], [{"Title": "A"}])
+
+    def test_finished_search_does_not_wait(self):
+        """Test a finished search returns immediately, whatever version the caller has seen"""
+        handle = SearchHandle("id", {})
+        handle.finish([{"Title": "A"}])
+        started = time.monotonic()
+        handle.wait_for_change(handle.version, timeout=10)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(handle.snapshot()["results"], [{"Title": "A"}])
+
+if __name__ == '__main__':
+    unittest.main()
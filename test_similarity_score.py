@@ -0,0 +1,43 @@
+import unittest
+from similarity_score import calculate_similarity_tfidf, calculate_similarity_tfidf_batch
+
+class TestBatchTfidfSimilarity(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.resume = "Python developer with SQL and machine learning experience"
+        self.job_descriptions = [
+            "Looking for a Python developer who knows SQL",
+            "Head chef needed for a busy kitchen",
+            "",
+            "Machine learning engineer, Python required",
+        ]
+
+    def test_scores_align_with_inputs(self):
+        """Test one score is returned per description, in order"""
+        scores = calculate_similarity_tfidf_batch(self.resume, self.job_descriptions)
+        self.assertEqual(len(scores), len(self.job_descriptions))
+        self.assertEqual(scores[2], 0.0)
+        self.assertGreater(scores[0], scores[1])
+        self.assertGreater(scores[3], scores[1])
+
+    def test_scores_are_bounded(self):
+        """Test scores are plain floats between 0 and 1"""
+        for score in calculate_similarity_tfidf_batch(self.resume, self.job_descriptions):
+            self.assertIsInstance(score, float)
+            self.assertGreaterEqual(score, 0.0)
+            self.assertLessEqual(score, 1.0 + 1e-9)
+
+    def test_identical_text_scores_one(self):
+        """Test a description identical to the resume scores 1"""
+        scores = calculate_similarity_tfidf_batch(self.resume, [self.resume])
+        self.assertAlmostEqual(scores[0], 1.0, places=6)
+        self.assertAlmostEqual(scores[0], calculate_similarity_tfidf(self.resume, self.resume), places=6)
+
+    def test_empty_inputs(self):
+        """Test handling of empty resume and empty job list"""
+        self.assertEqual(calculate_similarity_tfidf_batch("", ["Python"]), [0.0])
+        self.assertEqual(calculate_similarity_tfidf_batch(self.resume, []), [])
+        self.assertEqual(calculate_similarity_tfidf_batch(self.resume, ["", ""]), [0.0, 0.0])
+
+if __name__ == '__main__':
+    unittest.main()
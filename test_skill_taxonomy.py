@@ -0,0 +1,54 @@
+import unittest
+from skill_taxonomy import PhraseMatcher, SkillTaxonomy, get_skill_taxonomy, skill_tokens
+
+TAXONOMY = {
+    "skills": {
+        "python": {"category": "hard", "synonyms": ["python3"]},
+        "machine learning": {"category": "hard", "synonyms": ["ml"]},
+        "c++": {"category": "hard", "synonyms": []},
+        "ci/cd": {"category": "hard", "synonyms": ["continuous integration"]},
+        "communication": {"category": "soft", "synonyms": ["presentation skills"]},
+    },
+    "roles": {
+        "data scientist": {"aliases": ["data science"], "skills": ["python", "machine learning", "communication"]},
+        "machine learning engineer": {"aliases": ["ml engineer"], "skills": ["python", "c++", "ci/cd"]},
+    },
+}
+
+class TestSkillTaxonomy(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = SkillTaxonomy(TAXONOMY)
+
+    def test_tokens_keep_skill_punctuation(self):
+        """Test names like c++ and ci/cd survive tokenization but trailing periods do not"""
+        self.assertEqual(skill_tokens("C++, CI/CD and Node.js."), ["c++", "ci/cd", "and", "node.js"])
+
+    def test_match_resolves_synonyms(self):
+        """Test synonyms map to their canonical skill"""
+        skills = self.taxonomy.match("Python3 developer, continuous integration, great presentation skills")
+        self.assertEqual(skills, {"python", "ci/cd", "communication"})
+
+    def test_longest_match_wins(self):
+        """Test the longest phrase starting at a position is taken"""
+        matcher = PhraseMatcher({"machine learning": "ml", "machine learning engineer": "mle"})
+        self.assertEqual(matcher.find(skill_tokens("Machine Learning Engineer, machine learning")), ["mle", "ml"])
+
+    def test_skills_for_role(self):
+        """Test job titles resolve to role skills through names and aliases"""
+        self.assertEqual(self.taxonomy.skills_for_role("Senior Data Scientist"), {"python", "machine learning", "communication"})
+        self.assertEqual(self.taxonomy.skills_for_role("ML Engineer II"), {"python", "c++", "ci/cd"})
+        self.assertEqual(self.taxonomy.skills_for_role("Chef"), frozenset())
+
+    def test_unknown_role_skill_rejected(self):
+        """Test a role listing a skill outside the taxonomy is rejected"""
+        with self.assertRaises(ValueError):
+            SkillTaxonomy({"skills": {}, "roles": {"chef": {"skills": ["cooking"]}}})
+
+    def test_bundled_taxonomy_loads(self):
+        """Test the shipped taxonomy file is consistent"""
+        taxonomy = get_skill_taxonomy()
+        self.assertIn("python", taxonomy.skills_for_role("Software Engineer"))
+        self.assertEqual(taxonomy.category("communication"), "soft")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import re
+import threading
+
+from cache import TTLCache
+
+# Word tokens of two or more characters, the same pattern TfidfVectorizer uses
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# Sentence boundaries: terminal punctuation or line breaks
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Number of recently seen documents whose token streams are kept
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "2048"))
+
+# "regex" (default) or "spacy" for spaCy's rule-based tokenizer. SPACY_MODEL picks
+# the model whose tokenizer is used; by default a blank English pipeline
+TEXT_TOKENIZER = os.getenv("TEXT_TOKENIZER", "regex")
+SPACY_MODEL = os.getenv("SPACY_MODEL")
+
+# Pipeline components spaCy models ship with; none of them is needed for tokens,
+# is_alpha or is_stop
+SPACY_EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def normalize(text):
+    """
+    Lowercase text and collapse all runs of whitespace to single spaces.
+    """
+    return " ".join(text.lower().split())
+
+
+def tokenize(text):
+    """
+    Lowercased word tokens of a text, without caching.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def tokenize_many(texts, batch_size=256):
+    """
+    Token lists for many texts with the configured tokenizer, without caching.
+    The spaCy tokenizer processes the texts in batches through nlp.pipe.
+    """
+    if TEXT_TOKENIZER == "spacy":
+        return [_spacy_tokens(doc) for doc in get_nlp().pipe(texts, batch_size=batch_size)]
+    return [tokenize(text) for text in texts]
+
+
+def split_sentences(text):
+    """
+    Split text into non-empty sentences.
+    """
+    return [sentence for sentence in SENTENCE_PATTERN.split(text) if sentence.strip()]
+
+
+def get_nlp():
+    """
+    Return the tokenizer-only spaCy pipeline, loading it on first use.
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                if SPACY_MODEL:
+                    _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDED_COMPONENTS)
+                else:
+                    _nlp = spacy.blank("en")
+    return _nlp
+
+
+def _spacy_tokens(doc):
+    # Mirror the regex tokenizer: lowercase word tokens of two or more characters
+    return [token.lower_ for token in doc if len(token) > 1 and not (token.is_punct or token.is_space)]
+
+
+class TokenStream:
+    """
+    A document tokenized once, in the form every consumer shares: the TF-IDF
+    and Doc2Vec scorers read tokens, keyword extraction reads alpha tokens.
+    """
+
+    __slots__ = ("tokens",)
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def alpha_tokens(self):
+        return [token for token in self.tokens if token.isalpha()]
+
+    def keywords(self, stop_words):
+        """
+        Set of alphabetic tokens that are not stop words.
+        """
+        return {token for token in self.tokens if token.isalpha() and token not in stop_words}
+
+
+_streams = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+
+
+def get_token_stream(text):
+    """
+    Return the token stream for a document, tokenizing it only the first time
+    it is seen. The same job description passes through IDF updates, scoring
+    and indexing, so this saves repeated passes over its text.
+    """
+    return get_token_streams([text])[0]
+
+
+def get_token_streams(texts, batch_size=256):
+    """
+    Token streams for many documents at once. Documents not yet cached are
+    tokenized together; with the spaCy tokenizer this goes through nlp.pipe.
+    Returns:
+        list[TokenStream]: One stream per text, in order.
+    """
+    texts = [text or "" for text in texts]
+    streams = [_streams.get(text) for text in texts]
+    missing = list({text: None for text, stream in zip(texts, streams) if stream is None})
+    if not missing:
+        return streams
+
+    fresh = {}
+    for text, tokens in zip(missing, tokenize_many(missing, batch_size=batch_size)):
+        fresh[text] = TokenStream(tokens)
+        _streams.set(text, fresh[text])
+    return [stream if stream is not None else fresh[text] for text, stream in zip(texts, streams)]
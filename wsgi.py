@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production serving:
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+With preload_app (see gunicorn.conf.py) this module is imported once in the
+master process, so the models loaded here are shared by every forked worker.
+"""
+from app import app, preload_models
+
+preload_models()
+
+application = app